@@ -0,0 +1,216 @@
+"""Benchmark runner of the interpreter
+
+Every benchmark program is run as a separate interpreter process, the same
+way as the interpreter is used. Reported values are the best of repeated
+runs:
+- load:     run with --compile-only (startup, XML loading and all checks)
+- exec:     full run without the load time
+- inst/s:   executed instructions (--stats --insts) per second of exec time
+- RSS:      peak resident set size of the full run
+
+Results can be saved to JSON and compared with saved baseline, runner fails
+when execution time of any benchmark gets worse more than the tolerance.
+
+Usage: python3 benchmarks/run.py [options] [-- interpreter arguments]
+
+Author: Hung Do
+File:   run.py
+"""
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROGRAM_DIR = os.path.join(BENCH_DIR, 'programs')
+INTERPRETER = os.path.join(os.path.dirname(BENCH_DIR), 'interpret.py')
+
+
+def input_numbers(path: str):
+    """Write input with one number per line"""
+    with open(path, 'w') as _f:
+        _f.writelines(f"{number}\n" for number in range(1, 200001))
+
+
+# name: (program, function creating input file or None)
+BENCHMARKS = {
+        # integer arithmetic loop
+        'arithmetic': ('arithmetic.xml', None),
+        # CALL with CREATEFRAME/PUSHFRAME/POPFRAME
+        'recursion': ('recursion.xml', None),
+        # the arithmetic loop written with stack instructions
+        'stack': ('stack.xml', None),
+        # CONCAT, SETCHAR and GETCHAR
+        'strings': ('strings.xml', None),
+        # heavy WRITE output
+        'output': ('output.xml', None),
+        # heavy READ input
+        'input': ('input.xml', input_numbers),
+        }
+
+
+def run_interpreter(args: list) -> tuple:
+    """Run interpreter process and wait for it
+
+    Parameters:
+    args (list): Arguments of the interpreter
+
+    Returns:
+    float, int, int: Wall time in seconds, exit code and peak RSS in KiB
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, INTERPRETER] + args,
+                               stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    rss = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return elapsed, process.returncode, rss
+
+
+def run_benchmark(name: str, repeat: int, extra_args: list, work_dir: str) -> dict:
+    """Measure one benchmark
+
+    Parameters:
+    name (str):         Name of the benchmark
+    repeat (int):       Number of measured runs
+    extra_args (list):  Additional arguments of the interpreter
+    work_dir (str):     Directory for temporary files
+
+    Returns:
+    dict: Measured values; None if the program failed
+    """
+    program, make_input = BENCHMARKS[name]
+    args = ['--source', os.path.join(PROGRAM_DIR, program)]
+    if make_input is not None:
+        input_path = os.path.join(work_dir, f"{name}.in")
+        if not os.path.exists(input_path):
+            make_input(input_path)
+        args += ['--input', input_path]
+
+    # number of instructions does not depend on interpreter settings
+    stats_path = os.path.join(work_dir, f"{name}.stats")
+    _, code, _ = run_interpreter(args + ['--stats', stats_path, '--insts'])
+    if code != 0:
+        return None
+    with open(stats_path) as _f:
+        insts = int(_f.read())
+
+    image_path = os.path.join(work_dir, f"{name}.ippc")
+    load = min(run_interpreter(args[:2] + ['--compile-only', image_path])[0]
+               for _ in range(repeat))
+
+    total = None
+    rss = 0
+    for _ in range(repeat):
+        elapsed, code, peak = run_interpreter(args + extra_args)
+        if code != 0:
+            return None
+        total = elapsed if total is None else min(total, elapsed)
+        rss = max(rss, peak)
+
+    exec_time = max(total - load, 1e-9)
+    return {'load': load, 'exec': exec_time, 'total': total,
+            'insts': insts, 'ips': insts / exec_time, 'rss': rss}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> dict:
+    """Compare execution times with baseline
+
+    Parameters:
+    results (dict):     Measured values by benchmark name
+    baseline (dict):    Saved values by benchmark name
+    tolerance (float):  Allowed slowdown (0.1 = 10 %)
+
+    Returns:
+    dict: Relative change of execution time by benchmark name; names
+        of regressed benchmarks are in key 'regressions'
+    """
+    changes = {}
+    regressions = []
+    for name, values in results.items():
+        if values is None or not baseline.get(name):
+            continue
+        change = values['exec'] / baseline[name]['exec'] - 1
+        changes[name] = change
+        if change > tolerance:
+            regressions.append(name)
+    return {'changes': changes, 'regressions': regressions}
+
+
+def print_table(results: dict, comparison: dict):
+    """Print measured values"""
+    changes = comparison['changes'] if comparison else {}
+    print(f"{'benchmark':<12}{'load [s]':>10}{'exec [s]':>10}{'Minst/s':>10}"
+          f"{'RSS [MiB]':>11}{'baseline':>10}")
+    for name, values in results.items():
+        if values is None:
+            print(f"{name:<12}{'failed':>10}")
+            continue
+        change = f"{changes[name] * 100:+.1f} %" if name in changes else ''
+        print(f"{name:<12}{values['load']:>10.3f}{values['exec']:>10.3f}"
+              f"{values['ips'] / 1e6:>10.3f}{values['rss'] / 1024:>11.1f}"
+              f"{change:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser('IPPcode22 interpreter benchmarks')
+    parser.add_argument('benchmarks', nargs='*', metavar='name',
+            help=f"Benchmarks to run (default all: {', '.join(BENCHMARKS)})")
+    parser.add_argument('--repeat', type=int, default=3,
+            help='Number of measured runs, the best one is reported')
+    parser.add_argument('--save', metavar='filename',
+            help='Store results to the JSON file')
+    parser.add_argument('--baseline', metavar='filename',
+            help='Compare results with the JSON file stored by --save')
+    parser.add_argument('--tolerance', type=float, default=10.0, metavar='%',
+            help='Allowed slowdown against baseline in percent (default 10)')
+    argv = sys.argv[1:]
+    # arguments after -- are passed to the interpreter
+    extra_args = []
+    if '--' in argv:
+        extra_args = argv[argv.index('--') + 1:]
+        argv = argv[:argv.index('--')]
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmark {', '.join(unknown)}!")
+    if args.repeat < 1:
+        parser.error('--repeat expects positive number!')
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in args.benchmarks or BENCHMARKS:
+            results[name] = run_benchmark(name, args.repeat, extra_args, work_dir)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline) as _f:
+            baseline = json.load(_f)['benchmarks']
+        comparison = compare(results, baseline, args.tolerance / 100)
+    print_table(results, comparison)
+
+    if args.save:
+        with open(args.save, 'w') as _f:
+            json.dump({'interpreter_args': extra_args, 'benchmarks': results},
+                      _f, indent=1)
+
+    if any(values is None for values in results.values()):
+        return 1
+    if comparison and comparison['regressions']:
+        print(f"Regressions: {', '.join(comparison['regressions'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
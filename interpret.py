@@ -4,29 +4,35 @@ Author: Hung Do
 File:   interpreter.py
 """
 #!/usr/bin/env python3
-from proj2_module.statement import Statement
 from proj2_module.coredata import CoreData
-from proj2_module.instruction_set import *
+from proj2_module.error import ProgramExit
 from proj2_module.arguments import arg_process
-from proj2_module.xml_parser import xml_parser
-from proj2_module.instruction_set import instruct_set
+from proj2_module.interpreter import Interpreter
+from proj2_module.batch import run_batch
+from proj2_module.prefork import run_program_inputs
+from proj2_module.server import serve
 
 def main() -> int:
     # argument processing
-    arg_process()
+    source_file, input_file = arg_process()
 
-    # XML parsing and sorting commands
-    lof_ins = xml_parser()
-    lof_ins.sort(key=(lambda statement: statement.order))
-    CoreData.set_jumps(lof_ins)
-
-    # execute program (commands)
-    nof_ins = len(lof_ins)
-    ins_index = 0
-    while ins_index < nof_ins:
-        stat: Statement = lof_ins[ins_index]
-        ins_index = instruct_set[stat.ins](ins_index, stat.args)
-        CoreData.ins_performed += 1
+    try:
+        if CoreData.batch_path is not None:
+            # many programs executed one by one in worker processes
+            return run_batch(CoreData.batch_path, Interpreter.from_arguments(),
+                             CoreData.jobs)
+        if CoreData.inputs_path is not None:
+            # one program loaded once and executed by forked workers
+            return run_program_inputs(CoreData.inputs_path,
+                                      Interpreter.from_arguments().load(source_file),
+                                      CoreData.jobs, CoreData.inputs_to_files)
+        if CoreData.serve_path is not None:
+            # programs sent by clients, loaded programs are kept in memory
+            return serve(CoreData.serve_path,
+                         Interpreter.from_arguments(program_cache={}))
+    except ProgramExit as exc:
+        return exc.code
+    return Interpreter.from_arguments().run(source_file, input_file)
 
 
 if __name__ == "__main__":
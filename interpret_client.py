@@ -0,0 +1,150 @@
+"""Client of the interpreter server
+
+Client takes the same arguments as interpret.py and gives the same output
+and exit code, but the program is executed by the server (interpret.py
+--serve) listening on the socket given by --socket or by environment
+variable IPPCODE22_SOCKET. Callers such as test.php can use the client
+instead of interpret.py (--int-script).
+
+Options other than --source and --input change the interpreter itself,
+so the client runs interpret.py with them. The same is done when no
+server is running. Standard input (source or input of the program) is
+read as a whole before the program is executed.
+
+The client doesn't import proj2_module, which would cost the startup
+time saved by the server. Protocol is described in proj2_module/server.py.
+
+Author: Hung Do
+File:   interpret_client.py
+"""
+#!/usr/bin/env python3
+import json
+import os
+import socket
+import struct
+import sys
+
+INTERPRETER = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'interpret.py')
+SOCKET_VARIABLE = 'IPPCODE22_SOCKET'
+FRAME_HEADER = struct.Struct('!I')
+UNDEFINED_ERROR = 99
+
+
+def run_locally(argv: list):
+    """Replace the client by interpret.py with the arguments"""
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, INTERPRETER] + argv)
+
+
+def parse_arguments(argv: list) -> dict:
+    """Find values of options handled by the client
+
+    Parameters:
+    argv (list): Arguments of the client
+
+    Returns:
+    dict: Values of --source, --input and --socket by option name (without
+        dashes); None if there are other or wrong arguments
+    """
+    options = {}
+    args = iter(argv)
+    for arg in args:
+        name, sep, value = arg.partition('=')
+        if name not in ('--source', '--input', '--socket'):
+            return None
+        if not sep:
+            value = next(args, None)
+            if value is None:
+                return None
+        options[name[2:]] = value
+    return options
+
+
+def strip_socket(argv: list) -> list:
+    """Return arguments without --socket option"""
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == '--socket':
+            skip = True
+        elif not arg.startswith('--socket='):
+            result.append(arg)
+    return result
+
+
+def receive_frames(stream, count: int) -> list:
+    """Receive frames of one message
+
+    Parameters:
+    stream (file):  Binary stream of the connection
+    count (int):    Number of frames in the message
+
+    Returns:
+    list: Data (bytes) of frames
+    """
+    frames = []
+    for _ in range(count):
+        header = stream.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            raise EOFError
+        size, = FRAME_HEADER.unpack(header)
+        frame = stream.read(size)
+        if len(frame) < size:
+            raise EOFError
+        frames.append(frame)
+    return frames
+
+
+def main() -> int:
+    # argparse is not used, its import takes a noticeable part of startup
+    options = parse_arguments(sys.argv[1:])
+    argv = strip_socket(sys.argv[1:])
+    if options is None:
+        # other options and wrong arguments are left to interpret.py
+        run_locally(argv)
+    socket_path = options.get('socket', os.environ.get(SOCKET_VARIABLE))
+    if socket_path is None or not ('source' in options or 'input' in options):
+        run_locally(argv)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        run_locally(argv)
+
+    # paths are sent absolute, server may run in another directory
+    source = os.path.abspath(options['source']) if 'source' in options else None
+    input_path = os.path.abspath(options['input']) if 'input' in options else None
+    stdin = b''
+    if source is None or input_path is None:
+        stdin = sys.stdin.buffer.read()
+    header = json.dumps({'source': source, 'input': input_path}).encode()
+    frames = [header,
+              stdin if source is None else b'',
+              stdin if input_path is None else b'']
+
+    try:
+        sock.sendall(b''.join(FRAME_HEADER.pack(len(frame)) + frame
+                              for frame in frames))
+        with sock.makefile('rb') as stream:
+            header, stdout, stderr = receive_frames(stream, 3)
+        exit_code = json.loads(header)['exit_code']
+    except (OSError, EOFError, ValueError, KeyError):
+        sys.stderr.write(f"Server on {socket_path} failed to execute the program\n")
+        return UNDEFINED_ERROR
+    finally:
+        sock.close()
+
+    sys.stdout.buffer.write(stdout)
+    sys.stdout.flush()
+    sys.stderr.buffer.write(stderr)
+    sys.stderr.flush()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
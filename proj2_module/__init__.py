@@ -0,0 +1,3 @@
+from .interpreter import Interpreter
+from .async_interpreter import AsyncInterpreter
+from .error import ProgramExit
@@ -6,29 +6,162 @@ Module: proj2_module
 """
 import argparse
 import os
+import socket
 from .coredata import CoreData
-from .error import ErrorCode
+from .sampler import SamplingProfiler
+
+class StatsAction(argparse.Action):
+    """Collects statistics options into groups of their --stats files
+
+    --stats FILE starts new group, every following statistic option
+    is appended to the last group, so statistics keep order of options.
+    """
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        groups = getattr(namespace, self.dest) or []
+        if self.const is None:
+            if any(values == path for path, _ in groups):
+                parser.error(f'Statistics file {values} is used twice!')
+            groups.append((values, []))
+        elif not groups:
+            parser.error(f'{option_string} must follow --stats!')
+        else:
+            groups[-1][1].append(self.const)
+        setattr(namespace, self.dest, groups)
+
 
 def arg_process():
+    """Process arguments and store interpreter settings to CoreData
+
+    Returns:
+    str, str: Path to source file and input file; None for stdin
+    """
     parser = argparse.ArgumentParser('IPPcode22 interpreter')
     parser.add_argument('--source', action='store', metavar='filename',
             nargs=1, help='Source file in XML format')
     parser.add_argument('--input', action='store', metavar='filename',
             nargs=1, help='Input file')
+    parser.add_argument('--engine', action='store', default='threaded',
+            choices=('threaded', 'codegen'),
+            help='Execution engine: pre-bound instructions (default) or '
+                 'program compiled to Python functions')
+    parser.add_argument('--codegen-cache', action='store', metavar='dirname',
+            nargs=1, help='Directory for cached programs compiled by '
+                          '--engine=codegen')
+    parser.add_argument('--image-cache', action='store', metavar='dirname',
+            nargs=1, help='Directory for compiled program images of sources')
+    parser.add_argument('--compile-only', action='store', metavar='filename',
+            nargs=1, help='Store compiled program image of the source to '
+                          'the file without running the program')
+    parser.add_argument('--output-buffer', action='store',
+            metavar='SIZE|line|none',
+            help='Buffering of program output: buffer size in bytes, flush '
+                 'at the end of line or flush after every WRITE')
+    parser.add_argument('--lazy', action='store_true',
+            help='Check and decode instructions on their first execution')
+    parser.add_argument('--profile', action='store', metavar='filename',
+            nargs=1, help='Store execution counts and times of opcodes and '
+                          'instructions to the JSON file')
+
+    parser.add_argument('--sample-profile', action='store', metavar='filename',
+            nargs=1, help='Periodically sample executed instruction and call '
+                          'stack, store collapsed stacks to the file')
+    parser.add_argument('--sample-interval', action='store', metavar='ms',
+            type=float, default=SamplingProfiler.DEFAULT_INTERVAL * 1000,
+            help='Sampling interval in milliseconds (default 1)')
+    parser.add_argument('--stats', action=StatsAction, dest='stats',
+            metavar='filename', help='File for statistics given by following '
+                                     'options')
+    parser.add_argument('--insts', action=StatsAction, dest='stats', nargs=0,
+            const='insts', help='Number of executed instructions')
+    parser.add_argument('--hot', action=StatsAction, dest='stats', nargs=0,
+            const='hot', help='Order of the most executed instruction')
+    parser.add_argument('--vars', action=StatsAction, dest='stats', nargs=0,
+            const='vars', help='Maximal number of initialized variables')
+    parser.add_argument('--frequent', action=StatsAction, dest='stats', nargs=0,
+            const='frequent', help='The most frequent opcodes in the source')
+
+    parser.add_argument('--batch', action='store', metavar='dirname|manifest',
+            nargs=1, help='Run all tests (.src, .in, .out, .rc) in the directory '
+                          'or listed in the manifest, write results as JSON lines')
+    parser.add_argument('--inputs', action='store',
+            metavar='dirname|glob|@manifest', nargs=1,
+            help='Load the source once and run it with every input file in '
+                 'the directory, matching the pattern or listed in the manifest')
+    parser.add_argument('--outputs', action='store', default='stream',
+            choices=('stream', 'files'),
+            help='Results of --inputs: JSON lines in order of inputs (default) '
+                 'or files INPUT.stdout, INPUT.stderr and INPUT.rc')
+    parser.add_argument('-j', '--jobs', action='store', type=int,
+            default=os.cpu_count() or 1, metavar='N',
+            help='Number of worker processes of --batch and --inputs '
+                 '(default all CPUs)')
+    parser.add_argument('--serve', action='store', metavar='socket',
+            nargs=1, help='Keep running and execute programs sent by '
+                          'interpret_client.py to the Unix domain socket')
 
     args = parser.parse_args()
-    if args.source is None and args.input is None:
+    modes = [option for option, value in (('--batch', args.batch),
+                                          ('--serve', args.serve),
+                                          ('--inputs', args.inputs)) if value]
+    if len(modes) > 1:
+        parser.error(f'{modes[0]} cannot be used with {modes[1]}!')
+    if modes:
+        if (args.input or args.compile_only or args.profile or args.stats or
+                args.sample_profile):
+            parser.error(f'{modes[0]} cannot be used with --input, --compile-only, '
+                         '--profile, --stats or --sample-profile!')
+        if args.source and not args.inputs:
+            parser.error(f'{modes[0]} cannot be used with --source!')
+        if args.lazy and args.inputs:
+            parser.error('--inputs cannot be used with --lazy!')
+        if args.jobs < 1:
+            parser.error('--jobs expects positive number!')
+        if args.serve and not hasattr(socket, 'AF_UNIX'):
+            parser.error('--serve is not supported on this platform!')
+    elif args.source is None and args.input is None:
         parser.error('At least one argument must be used!')
-    if args.source:
-        if not os.path.exists(args.source[0]):
-            ErrorCode.exit_error(f"File {args.source[0]} does not exists!",
-                                 ErrorCode.UNDEFINED_ERROR)
-        CoreData.source_file = args.source[0]
-    if args.input:
-        if not os.path.exists(args.input[0]):
-            ErrorCode.exit_error(f"File {args.input[0]} does not exists!",
-                                 ErrorCode.UNDEFINED_ERROR)
-        # store file content as a list
-        _f = open(args.input[0], 'r')
-        CoreData.input_file = _f.read().split('\n')
-        _f.close()
+    if args.outputs != 'stream' and not args.inputs:
+        parser.error('--outputs can be used only with --inputs!')
+    if args.lazy and (args.engine == 'codegen' or args.image_cache or
+                      args.compile_only):
+        parser.error('--lazy cannot be used with --engine=codegen, '
+                     '--image-cache or --compile-only!')
+    if args.profile and args.engine == 'codegen':
+        parser.error('--profile cannot be used with --engine=codegen!')
+    if args.sample_profile and not SamplingProfiler.available():
+        parser.error('--sample-profile is not supported on this platform!')
+    if args.sample_interval <= 0:
+        parser.error('--sample-interval expects positive number!')
+    if args.stats and args.engine == 'codegen':
+        parser.error('--stats cannot be used with --engine=codegen!')
+    if (args.output_buffer is not None and
+            args.output_buffer not in ('line', 'none') and
+            not (args.output_buffer.isdigit() and int(args.output_buffer) > 0)):
+        parser.error('--output-buffer expects positive size, line or none!')
+    CoreData.output_buffer = args.output_buffer
+    CoreData.engine = args.engine
+    CoreData.lazy_decode = args.lazy
+    if args.codegen_cache:
+        CoreData.codegen_cache = args.codegen_cache[0]
+    if args.image_cache:
+        CoreData.image_cache = args.image_cache[0]
+    if args.compile_only:
+        CoreData.compile_only = args.compile_only[0]
+    CoreData.jobs = args.jobs
+    if args.batch:
+        CoreData.batch_path = args.batch[0]
+    if args.inputs:
+        CoreData.inputs_path = args.inputs[0]
+        CoreData.inputs_to_files = args.outputs == 'files'
+    if args.serve:
+        CoreData.serve_path = args.serve[0]
+    if args.profile:
+        CoreData.profile_file = args.profile[0]
+    if args.sample_profile:
+        CoreData.sample_file = args.sample_profile[0]
+        CoreData.sample_interval = args.sample_interval / 1000
+    if args.stats:
+        CoreData.stats_groups = args.stats
+    return (args.source[0] if args.source else None,
+            args.input[0] if args.input else None)
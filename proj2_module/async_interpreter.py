@@ -0,0 +1,268 @@
+"""Interpreter executing many programs concurrently in one asyncio event loop
+
+Every program runs in slices of instructions, the event loop gets control
+back between slices, so programs take turns in the order of the loop's
+ready queue. Slice ends after slice_size instructions (or, with time_slice,
+after as many such chunks as fit in the time), before READ waiting for
+input and at the end of the program.
+
+Program state lives in CoreData, so each program keeps its own copy
+of the runtime state (CoreData.save_runtime_state) and it is swapped
+in for its slices. Slices of all programs are executed one at a time,
+together with Interpreter.run calls from other threads.
+
+Input of READ is awaited from an asynchronous source (readline() coroutine
+like asyncio.StreamReader), the next line is read before READ is executed.
+Output of WRITE is collected during the slice and passed to an asynchronous
+sink after it (coroutine function or writer with drain() coroutine like
+asyncio.StreamWriter).
+
+Usage:
+    interpreter = AsyncInterpreter(slice_size=500)
+    exit_code = await interpreter.run_async('program.xml', reader, writer)
+
+Author: Hung Do
+File:   async_interpreter.py
+Module: proj2_module
+"""
+import asyncio
+import inspect
+import io
+import sys
+import time
+
+from .coredata import CoreData
+from .error import ProgramExit
+from .output import Output
+from .interpreter import Interpreter
+from .execution import translate_program
+from .program_image import load_program
+
+
+class AsyncLineReader:
+    """Lines of asynchronous source for READ
+
+    READ itself cannot wait, so the scheduler awaits fill() whenever
+    the next instruction is READ and no line is ready.
+    Lines are the same as lines returned by input().
+    """
+
+    def __init__(self, source, encoding: str='utf-8'):
+        self._source = source
+        self._encoding = encoding
+        self._line = None
+        self._eof = False
+        self.ready = False
+
+
+    async def fill(self):
+        """Read the next line from the source"""
+        line = await self._source.readline()
+        if not line:
+            self._eof = True
+        else:
+            if isinstance(line, bytes):
+                line = line.decode(self._encoding)
+            if line.endswith('\n'):
+                line = line[:-1]
+            self._line = line
+        self.ready = True
+
+
+    def readline(self) -> str:
+        """Return the line read by fill()
+
+        Returns:
+        str: Read line; None at the end of the source
+        """
+        line = self._line
+        self._line = None
+        self.ready = self._eof
+        return line
+
+
+class AsyncInterpreter(Interpreter):
+    DEFAULT_SLICE_SIZE = 1000
+
+    def __init__(self, slice_size: int=DEFAULT_SLICE_SIZE, time_slice: float=None,
+                 **settings):
+        """
+        Parameters:
+        slice_size (int):   Number of instructions executed without
+                            giving control to the event loop
+        time_slice (float): Duration of the slice in seconds, slice is
+                            extended by slice_size instructions until
+                            the time is over; None for one chunk
+        settings (dict):    Values of settings (see Interpreter.DEFAULTS)
+
+        """
+        super().__init__(**settings)
+        if slice_size < 1:
+            raise ValueError('Slice size must be positive')
+        if time_slice is not None and time_slice <= 0:
+            raise ValueError('Time slice must be positive')
+        if self.settings['engine'] == 'codegen':
+            # compiled basic blocks would execute READ without waiting
+            raise ValueError('Engine codegen cannot be used asynchronously')
+        for name in ('compile_only', 'profile_file', 'sample_file', 'loaded_program'):
+            if self.settings[name] is not None:
+                raise ValueError(f"Setting {name} cannot be used asynchronously")
+        if self.settings['stats_groups']:
+            raise ValueError('Setting stats_groups cannot be used asynchronously')
+        self.slice_size = slice_size
+        self.time_slice = time_slice
+
+
+    def _enter(self, state: dict, output, stderr):
+        """Swap state of the program in (None for new program), return
+        replaced stderr"""
+        self._apply_settings(reset=state is None)
+        if state is not None:
+            CoreData.restore_runtime_state(state)
+        Output.setup(CoreData.output_buffer, output)
+        real_stderr = sys.stderr
+        sys.stderr = stderr
+        return real_stderr
+
+
+    def _leave(self, real_stderr) -> dict:
+        """Swap state of the program out and return it"""
+        Output.flush()
+        Output.stream = None
+        sys.stderr = real_stderr
+        return CoreData.save_runtime_state()
+
+
+    def _run_slice(self, code: list, reads: list, prg_cntr: int,
+                   reader: AsyncLineReader, count_ins: bool) -> int:
+        """Execute instructions of one slice
+
+        Parameters:
+        code (list):        Translated instructions
+        reads (list):       True for program counter values of READ
+        prg_cntr (int):     Program counter of the first instruction
+        reader (AsyncLineReader): Input of the program; None if input
+                            is never awaited
+        count_ins (bool):   Count executed instructions
+
+        Returns:
+        int: Program counter of the next instruction
+        """
+        nof_ins = len(code)
+        deadline = None
+        if self.time_slice is not None:
+            deadline = time.perf_counter() + self.time_slice
+        while True:
+            for _ in range(self.slice_size):
+                if prg_cntr >= nof_ins:
+                    return prg_cntr
+                if reads[prg_cntr] and not reader.ready:
+                    return prg_cntr
+                prg_cntr = code[prg_cntr]()
+                if count_ins:
+                    CoreData.ins_performed += 1
+            if deadline is None or time.perf_counter() >= deadline:
+                return prg_cntr
+
+
+    @staticmethod
+    async def _send(sink, data: bytes):
+        """Pass output of the slice to the sink"""
+        if not data:
+            return
+        if callable(sink):
+            await sink(data)
+            return
+        sink.write(data)
+        drain = getattr(sink, 'drain', None)
+        if drain is not None:
+            await drain()
+        else:
+            sink.flush()
+
+
+    async def run_async(self, program=None, stdin=None, stdout=None,
+                        stderr=None) -> int:
+        """Execute the program in slices, give control to the event loop
+        between them
+
+        Parameters:
+        program (str|bytes|file): Path to XML source or program image, XML
+            source itself or binary stream with it; None for stdin
+        stdin (object):     Source with readline() coroutine; path to input
+                            file or file object (never awaited); None for
+                            empty input
+        stdout (object):    Coroutine function receiving output (bytes),
+                            writer with drain() coroutine, binary or text
+                            stream; None for stdout of the process
+        stderr (file):      Text stream for error messages and debug output;
+                            None for stderr of the process
+
+        Returns:
+        int: Exit code of the program
+        """
+        if stdout is None:
+            stdout = sys.stdout.buffer
+        else:
+            stdout = self._binary_output(stdout)
+        if stderr is None:
+            stderr = sys.stderr
+        output = io.BytesIO()
+
+        reader = None
+        if stdin is not None and inspect.iscoroutinefunction(
+                getattr(stdin, 'readline', None)):
+            reader = AsyncLineReader(stdin)
+
+        # program is loaded at once, its own state is created
+        exit_code = None
+        with self._lock:
+            real_stderr = self._enter(None, output, stderr)
+            try:
+                self._set_source(program)
+                if reader is not None:
+                    CoreData.input_file = reader
+                else:
+                    self._set_input(io.BytesIO() if stdin is None else stdin)
+                lof_ins = load_program()
+                count_ins = any(stat.ins == 'BREAK' for stat in lof_ins)
+                code = translate_program(lof_ins, count_ins, fuse=not count_ins)
+            except ProgramExit as exc:
+                exit_code = exc.code
+            finally:
+                state = self._leave(real_stderr)
+        if exit_code is not None:
+            await self._send(stdout, output.getvalue())
+            return exit_code
+
+        if reader is not None:
+            reads = [stat.ins == 'READ' for stat in lof_ins]
+        else:
+            reads = [False] * len(code)
+
+        prg_cntr = 0
+        while exit_code is None:
+            with self._lock:
+                real_stderr = self._enter(state, output, stderr)
+                try:
+                    prg_cntr = self._run_slice(code, reads, prg_cntr, reader, count_ins)
+                except ProgramExit as exc:
+                    exit_code = exc.code
+                finally:
+                    state = self._leave(real_stderr)
+            if exit_code is None and prg_cntr >= len(code):
+                exit_code = 0
+
+            data = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            await self._send(stdout, data)
+
+            if exit_code is not None:
+                break
+            if reads[prg_cntr] and not reader.ready:
+                await reader.fill()
+            else:
+                # other programs get their turn
+                await asyncio.sleep(0)
+        return exit_code
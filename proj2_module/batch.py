@@ -0,0 +1,161 @@
+"""Batch mode running many programs in one process
+
+Tests are the same as tests of test.php: program NAME.src with optional
+input NAME.in, expected output NAME.out and expected exit code NAME.rc
+(missing files are empty, missing exit code is 0). Tests are found
+in a directory (recursively) or listed in a manifest file, one path
+of .src file per line.
+
+Every test is executed in isolation by Interpreter.run with captured
+output and stderr. Tests are spread over a pool of worker processes,
+results are written to stdout as JSON lines in order of tests.
+
+Author: Hung Do
+File:   batch.py
+Module: proj2_module
+"""
+import functools
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from .error import ErrorCode
+from .interpreter import Interpreter
+
+
+def read_manifest(path: str) -> list:
+    """Return paths listed in the manifest file
+
+    Paths are relative to the directory of the manifest, empty lines
+    and lines starting with '#' are skipped.
+
+    Parameters:
+    path (str): Path to the manifest file
+
+    Returns:
+    list: Listed paths
+    """
+    base_dir = os.path.dirname(path)
+    with open(path) as _f:
+        lines = [line.strip() for line in _f]
+    return [os.path.join(base_dir, line) for line in lines
+            if line and not line.startswith('#')]
+
+
+def discover_tests(path: str) -> list:
+    """Find tests in the directory or in the manifest file
+
+    Parameters:
+    path (str): Directory with tests or manifest file
+
+    Returns:
+    list: Paths of .src files of tests
+    """
+    if os.path.isdir(path):
+        sources = []
+        for dir_path, dir_names, file_names in os.walk(path):
+            dir_names.sort()
+            sources += [os.path.join(dir_path, name) for name in sorted(file_names)
+                        if name.endswith('.src')]
+        return sources
+    return read_manifest(path)
+
+
+def _read_file(path: str, default: bytes) -> bytes:
+    """Return content of the file; default if the file doesn't exist"""
+    try:
+        with open(path, 'rb') as _f:
+            return _f.read()
+    except OSError:
+        return default
+
+
+def run_test(interpreter: Interpreter, source: str) -> dict:
+    """Execute one test in isolation
+
+    Parameters:
+    interpreter (Interpreter):  Interpreter executing the test
+    source (str):               Path to .src file of the test
+
+    Returns:
+    dict: Result of the test (name, exit code, outputs and pass/fail)
+    """
+    base = source[:-len('.src')] if source.endswith('.src') else source
+    input_path = base + '.in'
+    stdout = io.BytesIO()
+    stderr = io.StringIO()
+
+    start = time.perf_counter()
+    try:
+        # missing input is empty input
+        exit_code = interpreter.run(
+                source, input_path if os.path.exists(input_path) else os.devnull,
+                stdout, stderr)
+    except Exception:
+        stderr.write(traceback.format_exc())
+        exit_code = ErrorCode.UNDEFINED_ERROR
+    elapsed = time.perf_counter() - start
+
+    try:
+        expected_code = int(_read_file(base + '.rc', b'0').strip() or 0)
+    except ValueError:
+        expected_code = None
+    output = stdout.getvalue()
+    passed = exit_code == expected_code
+    if passed and expected_code == 0:
+        passed = output == _read_file(base + '.out', b'')
+
+    return {'name': base,
+            'exit_code': exit_code,
+            'expected_exit_code': expected_code,
+            'passed': passed,
+            'stdout': output.decode('utf-8', 'replace'),
+            'stderr': stderr.getvalue(),
+            'time': elapsed}
+
+
+def run_batch(path: str, interpreter: Interpreter, jobs: int) -> int:
+    """Execute all tests and write their results as JSON lines
+
+    Parameters:
+    path (str):                 Directory with tests or manifest file
+    interpreter (Interpreter):  Interpreter executing the tests
+    jobs (int):                 Number of worker processes
+
+    Returns:
+    int: 0 if all tests passed; 1 otherwise
+    """
+    try:
+        sources = discover_tests(path)
+    except OSError:
+        ErrorCode.exit_error(f"Cannot read tests from {path}",
+                             ErrorCode.UNDEFINED_ERROR)
+
+    run = functools.partial(run_test, interpreter)
+    pool = None
+    if jobs > 1 and len(sources) > 1:
+        # forked workers don't import the interpreter again
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else:
+            context = multiprocessing.get_context()
+        pool = context.Pool(jobs)
+        chunk_size = max(1, min(16, len(sources) // (jobs * 4)))
+        results = pool.imap(run, sources, chunk_size)
+    else:
+        results = map(run, sources)
+
+    all_passed = True
+    try:
+        for result in results:
+            all_passed = all_passed and result['passed']
+            sys.stdout.write(json.dumps(result) + '\n')
+            sys.stdout.flush()
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return 0 if all_passed else 1
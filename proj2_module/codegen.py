@@ -0,0 +1,411 @@
+"""Code generation backend (--engine=codegen)
+
+Sorted program is split into basic blocks and every block is translated
+into one Python function. Frequent instructions are generated inline with
+the same semantic checks as instruction handlers in instruction_set.py;
+other instructions call their pre-bound instruction built by
+compile_program(). Checks whose result is known when the code is generated
+(constant operands, proven types from type_inference.py) are resolved
+during generation.
+
+Variables used in a block are fetched from their frames once and kept
+in local variables of the block function until an instruction that
+changes frames.
+
+Author: Hung Do
+File:   codegen.py
+Module: proj2_module
+"""
+import hashlib
+import importlib.util
+import os
+from .error import ErrorCode
+from .coredata import CoreData
+from .statement import Statement
+from .instruction_set import compile_program
+from .string_buffer import buffer_append
+
+# instructions after which a new basic block starts
+BLOCK_END = ('JUMP', 'JUMPIFEQ', 'JUMPIFNEQ', 'JUMPIFEQS', 'JUMPIFNEQS',
+             'CALL', 'RETURN', 'EXIT')
+
+# instructions which change frames or variables stored in them
+FRAME_CHANGES = ('DEFVAR', 'CREATEFRAME', 'PUSHFRAME', 'POPFRAME')
+
+ARITHMETIC = {'ADD': '+', 'SUB': '-', 'MUL': '*', 'DIV': '/', 'IDIV': '//'}
+RELATION = {'LT': '<', 'GT': '>'}
+LOGIC = {'AND': 'and', 'OR': 'or'}
+
+NUMERIC_CHECK = ("{t1} not in ('int', 'float') or {t2} not in ('int', 'float')"
+                 " or {t1} != {t2}")
+
+
+def _missing(order: int):
+    ErrorCode.exit_error(f"Missing value while executing {order}. command",
+                         ErrorCode.RUNTIME_MISSING_VALUE)
+
+
+def _wrong_type(order: int):
+    ErrorCode.exit_error(
+            f"Wrong symbol's data type while executing {order}. command",
+            ErrorCode.RUNTIME_WRONG_TYPE)
+
+
+def _string_handling(order: int):
+    ErrorCode.exit_error(f"Wrong string handling while executing {order}. command",
+                         ErrorCode.RUNTIME_STRING_HANDLING)
+
+
+def _zero_division(order: int):
+    ErrorCode.exit_error(f"Cannot divide by zero at {order}. command",
+                         ErrorCode.RUNTIME_WRONG_VALUE)
+
+
+class _Operand:
+
+    def __init__(self, type_expr: str, value_expr: str, static: bool):
+        self.type_expr = type_expr
+        self.value_expr = value_expr
+        # type_expr is a literal known at generation time
+        self.static = static
+
+
+class CodeGenerator:
+
+    def __init__(self, lof_ins: list, count_ins: bool=False):
+        self._lof_ins = lof_ins
+        self._count_ins = count_ins
+        self._getters = {}
+        self._getter_args = []
+        self._cache = {}
+        self._lines = []
+        self._used_code = set()
+
+
+    def _leaders(self) -> list:
+        """Return sorted indices of instructions starting basic blocks"""
+        nof_ins = len(self._lof_ins)
+        leaders = {0}
+        for prg_cntr, stat in enumerate(self._lof_ins):
+            if stat.ins == 'LABEL':
+                # CALL jumps on the label, jumps after the label
+                leaders.add(prg_cntr)
+                leaders.add(prg_cntr + 1)
+            elif stat.ins in BLOCK_END:
+                leaders.add(prg_cntr + 1)
+        return sorted(leader for leader in leaders if leader < nof_ins)
+
+
+    def _emit(self, line: str):
+        self._lines.append('        ' + line)
+
+
+    def _load_var(self, arg) -> str:
+        """Return local name of variable, fetch it from frame if needed"""
+        var_name = arg.value
+        if var_name not in self._getters:
+            self._getters[var_name] = len(self._getter_args)
+            self._getter_args.append(arg)
+        index = self._getters[var_name]
+        if var_name not in self._cache:
+            self._emit(f"v{index} = g{index}()")
+            self._cache[var_name] = f"v{index}"
+        return self._cache[var_name]
+
+
+    def _symbol(self, arg, proven_type: str) -> _Operand:
+        """Return operand expressions of <symb>"""
+        if arg.type == 'var':
+            local = self._load_var(arg)
+            if proven_type is not None:
+                return _Operand(repr(proven_type), f"{local}._value", True)
+            return _Operand(f"{local}._type", f"{local}._value", False)
+        return _Operand(repr(arg.type), repr(arg.value), True)
+
+
+    def _check(self, cond: str, operands: list, error: str, order: int):
+        """Emit runtime check; resolve it now if all types are static"""
+        fmt = {f"t{i+1}": op.type_expr for i, op in enumerate(operands)}
+        cond = cond.format(**fmt)
+        if all(op.static for op in operands):
+            if eval(cond):
+                self._emit(f"{error}({order})")
+            return
+        self._emit(f"if {cond}:")
+        self._emit(f"    {error}({order})")
+
+
+    def _check_undef(self, operands: list, order: int):
+        dynamic = [op for op in operands if not op.static]
+        if dynamic:
+            cond = ' or '.join(f"{op.type_expr} == 'UNDEF'" for op in dynamic)
+            self._emit(f"if {cond}:")
+            self._emit(f"    _missing({order})")
+
+
+    def _store(self, var: str, value_expr: str, type_expr: str, static: bool):
+        """Store value with known type to the variable"""
+        if static:
+            self._emit(f"{var}._value = {value_expr}")
+            self._emit(f"{var}._type = {type_expr}")
+        else:
+            self._emit(f"{var}.value = {value_expr}")
+
+
+    def _operands(self, stat: Statement, first: int=1) -> list:
+        types = stat.types or (None,) * len(stat.args)
+        return [self._symbol(stat.args[i], types[i])
+                for i in range(first, len(stat.args))]
+
+
+    def _instruction(self, prg_cntr: int, stat: Statement) -> bool:
+        """Emit code of one instruction
+
+        Returns:
+        bool: True if emitted code always leaves the block
+
+        """
+        ins = stat.ins
+        order = prg_cntr + 1
+
+        if ins == 'LABEL':
+            return False
+
+        if ins == 'JUMP':
+            self._emit(f"return {CoreData.labels[stat.args[0].value]}")
+            return True
+
+        if ins == 'CALL':
+            self._emit(f"stack_func.append({prg_cntr})")
+            self._emit(f"return {CoreData.labels[stat.args[0].value] - 1}")
+            return True
+
+        if ins in ('JUMPIFEQ', 'JUMPIFNEQ'):
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            self._check("{t1} != {t2} and {t1} != 'nil' and {t2} != 'nil'",
+                        [op1, op2], '_wrong_type', order)
+            compare = '==' if ins == 'JUMPIFEQ' else '!='
+            target = CoreData.labels[stat.args[0].value]
+            self._emit(f"if {op1.value_expr} {compare} {op2.value_expr}:")
+            self._emit(f"    return {target}")
+            self._emit(f"return {prg_cntr + 1}")
+            return True
+
+        if ins == 'MOVE':
+            var = self._load_var(stat.args[0])
+            op1, = self._operands(stat)
+            self._check_undef([op1], order)
+            value = op1.value_expr
+            if stat.args[1].type == 'var' and op1.type_expr == "'string'":
+                # string buffer of the source variable must not be shared
+                value = f"str({value})"
+            self._store(var, value, op1.type_expr, op1.static)
+            return False
+
+        if ins in ARITHMETIC:
+            var = self._load_var(stat.args[0])
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            self._check(NUMERIC_CHECK, [op1, op2], '_wrong_type', order)
+            if ins in ('DIV', 'IDIV'):
+                self._emit(f"if {op2.value_expr} == 0:")
+                self._emit(f"    _zero_division({order})")
+            value = f"{op1.value_expr} {ARITHMETIC[ins]} {op2.value_expr}"
+            if ins == 'DIV':
+                self._store(var, value, "'float'", True)
+            else:
+                self._store(var, value, op1.type_expr, op1.static)
+            return False
+
+        if ins in RELATION or ins == 'EQ':
+            var = self._load_var(stat.args[0])
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            if ins == 'EQ':
+                self._check("{t1} != {t2} and {t1} != 'nil' and {t2} != 'nil'",
+                            [op1, op2], '_wrong_type', order)
+                compare = '=='
+            else:
+                self._check("{t1} == 'nil' or {t2} == 'nil' or {t1} != {t2}",
+                            [op1, op2], '_wrong_type', order)
+                compare = RELATION[ins]
+            self._store(var, f"{op1.value_expr} {compare} {op2.value_expr}",
+                        "'bool'", True)
+            return False
+
+        if ins in LOGIC:
+            var = self._load_var(stat.args[0])
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            self._check("{t1} != 'bool' or {t2} != 'bool'",
+                        [op1, op2], '_wrong_type', order)
+            self._store(var, f"({op1.value_expr} {LOGIC[ins]} {op2.value_expr})",
+                        "'bool'", True)
+            return False
+
+        if ins == 'NOT':
+            var = self._load_var(stat.args[0])
+            op1, = self._operands(stat)
+            self._check_undef([op1], order)
+            self._check("{t1} != 'bool'", [op1], '_wrong_type', order)
+            self._store(var, f"not {op1.value_expr}", "'bool'", True)
+            return False
+
+        if ins == 'CONCAT':
+            var = self._load_var(stat.args[0])
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            self._check("{t1} != 'string' or {t2} != 'string'",
+                        [op1, op2], '_wrong_type', order)
+            if stat.args[1].type == 'var' and stat.args[1].value == stat.args[0].value:
+                # appended to the variable in place
+                self._emit(f"{var}._value = _append({var}._value, str({op2.value_expr}))")
+            else:
+                self._store(var, f"{op1.value_expr} + {op2.value_expr}",
+                            "'string'", True)
+            return False
+
+        if ins == 'STRLEN':
+            var = self._load_var(stat.args[0])
+            op1, = self._operands(stat)
+            self._check_undef([op1], order)
+            self._check("{t1} != 'string'", [op1], '_wrong_type', order)
+            self._store(var, f"len({op1.value_expr})", "'int'", True)
+            return False
+
+        if ins in ('GETCHAR', 'STRI2INT'):
+            var = self._load_var(stat.args[0])
+            op1, op2 = self._operands(stat)
+            self._check_undef([op1, op2], order)
+            self._check("{t1} != 'string' or {t2} != 'int'",
+                        [op1, op2], '_wrong_type', order)
+            self._emit(f"if not 0 <= {op2.value_expr} < len({op1.value_expr}):")
+            self._emit(f"    _string_handling({order})")
+            char = f"{op1.value_expr}[{op2.value_expr}]"
+            if ins == 'GETCHAR':
+                self._store(var, char, "'string'", True)
+            else:
+                self._store(var, f"ord({char})", "'int'", True)
+            return False
+
+        # instruction without inline code, call pre-bound instruction
+        self._used_code.add(prg_cntr)
+        if ins in BLOCK_END:
+            self._emit(f"return c{prg_cntr}()")
+            return True
+        self._emit(f"c{prg_cntr}()")
+        if ins in FRAME_CHANGES:
+            self._cache = {}
+        return False
+
+
+    def generate(self) -> str:
+        """Generate Python source of the program
+
+        Source defines function make_blocks(c, g, stack_func, CoreData)
+        returning a dictionary {index_of_first_instruction: block_function}.
+        Parameters are pre-bound instructions, variable getters (both
+        indexed by position), stack of function calls and CoreData class.
+
+        Returns:
+        str: Python source code
+
+        """
+        leaders = self._leaders()
+        nof_ins = len(self._lof_ins)
+        blocks = []
+        for i, start in enumerate(leaders):
+            end = leaders[i + 1] if i + 1 < len(leaders) else nof_ins
+            self._lines.append(f"    def b{start}():")
+            self._cache = {}
+            left = False
+            for prg_cntr in range(start, end):
+                stat = self._lof_ins[prg_cntr]
+                if self._count_ins and stat.ins != 'BREAK':
+                    self._emit("CoreData.ins_performed += 1")
+                left = self._instruction(prg_cntr, stat)
+                if self._count_ins and stat.ins == 'BREAK':
+                    self._emit("CoreData.ins_performed += 1")
+            if not left:
+                self._emit(f"return {end}")
+            self._lines.append('')
+            blocks.append(start)
+
+        header = ["# generated from IPPcode22 program, do not edit",
+                  "def make_blocks(c, g, stack_func, CoreData):"]
+        header += [f"    c{prg_cntr} = c[{prg_cntr}]" for prg_cntr in sorted(self._used_code)]
+        header += [f"    g{index} = g[{index}]" for index in range(len(self._getter_args))]
+        header.append('')
+        footer = ["    return {" + ', '.join(f"{b}: b{b}" for b in blocks) + "}"]
+        return '\n'.join(header + self._lines + footer) + '\n'
+
+
+    @property
+    def getter_args(self) -> list:
+        """Arguments of variables in order of getters used by generated code"""
+        return self._getter_args
+
+
+def _load_module(source: str, cache_dir: str):
+    """Return namespace with executed generated source
+
+    With cache directory the source is stored as a module named by hash of
+    its content, so Python caches its bytecode in __pycache__. Module is
+    replaced atomically, so concurrent runs never import partially
+    written source.
+
+    """
+    namespace = {'_missing': _missing, '_wrong_type': _wrong_type,
+                 '_string_handling': _string_handling,
+                 '_zero_division': _zero_division,
+                 '_append': buffer_append}
+    if cache_dir is None:
+        exec(compile(source, '<ippcode22>', 'exec'), namespace)
+        return namespace
+
+    digest = hashlib.sha256(source.encode()).hexdigest()[:32]
+    path = os.path.join(cache_dir, f"ippcode22_{digest}.py")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if not os.path.exists(path):
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as _f:
+                _f.write(source)
+            os.replace(temp_path, path)
+    except OSError:
+        ErrorCode.exit_error(f"Cannot write generated code to {cache_dir}",
+                             ErrorCode.UNDEFINED_ERROR)
+    spec = importlib.util.spec_from_file_location(f"ippcode22_{digest}", path)
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(namespace)
+    spec.loader.exec_module(module)
+    return module.__dict__
+
+
+def compile_codegen(lof_ins: list, count_ins: bool=False, cache_dir: str=None) -> list:
+    """Translate sorted instructions into generated Python functions
+
+    Parameters:
+    lof_ins (list):     Sorted list of instructions (Statement)
+    count_ins (bool):   Count executed instructions in CoreData.ins_performed
+    cache_dir (str):    Directory for generated modules; None to compile
+                        generated source only in memory
+
+    Returns:
+    list: Block functions indexed by program counter value of the first
+        instruction of the block; other items are None
+
+    """
+    code = compile_program(lof_ins, fuse=False)
+    generator = CodeGenerator(lof_ins, count_ins)
+    source = generator.generate()
+
+    namespace = _load_module(source, cache_dir)
+    getters = [CoreData.var_getter(arg) for arg in generator.getter_args]
+    blocks = namespace['make_blocks'](code, getters, CoreData.stack_func, CoreData)
+
+    table = [None] * len(lof_ins)
+    for start, block in blocks.items():
+        table[start] = block
+    return table
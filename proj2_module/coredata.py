@@ -5,15 +5,38 @@ File:   coredata.py
 Module: proj2_module
 """
 import sys
-from .error import ErrorCode
-from .frame import Frame, Variable
+from .error import ErrorCode, ProgramExit
+from .output import Output
+from .input_reader import FileLineReader, StreamLineReader
+from .frame import Frame, FrameLayout, Variable
 from .statement import Statement, Argument
 
 class CoreData:
-    input_file: list = None
-    _line_index = 0
+    input_file: FileLineReader = None
+    _stdin_reader: StreamLineReader = None
     source_file = None
+    # XML source given as binary stream when source_file is None
+    source_stream = None
     ins_performed = 0
+    engine = 'threaded'
+    codegen_cache = None
+    image_cache = None
+    compile_only = None
+    lazy_decode = False
+    output_buffer = None
+    profile_file = None
+    stats_groups = []
+    sample_file = None
+    sample_interval = None
+    batch_path = None
+    inputs_path = None
+    inputs_to_files = False
+    jobs = 1
+    serve_path = None
+    # images of programs by hash of their source (see load_cached_program)
+    program_cache = None
+    # program loaded by Interpreter.load (see load_shared_program)
+    loaded_program = None
 
     REG_TYPE = {
             'var': r'(GF|LF|TF)@[a-zA-Z_$&%*!?-][a-zA-Z0-9_$&%*!?-]*',
@@ -25,9 +48,14 @@ class CoreData:
             'type': '(int|bool|string|float)'
             }
 
-    global_frame: Frame = Frame()
+    global_layout: FrameLayout = FrameLayout()
+    local_layout: FrameLayout  = FrameLayout()
+
+    global_frame: Frame = None
     temp_frame: Frame   = None
     local_frame: Frame  = None
+    # frames dropped by POPFRAME or CREATEFRAME, reused by CREATEFRAME
+    frame_pool = []
 
     labels = {}
     undef_labels = set()
@@ -35,103 +63,287 @@ class CoreData:
     stack_func = []
     stack_frames = []
     stack_vals = []
+    stack_types = []
+
+    # attributes holding state of executed program (see reset)
+    RUNTIME_STATE = ('input_file', '_stdin_reader', 'source_file', 'source_stream',
+                     'ins_performed', 'global_layout', 'local_layout',
+                     'global_frame', 'temp_frame', 'local_frame', 'frame_pool',
+                     'labels', 'undef_labels', 'stack_func', 'stack_frames',
+                     'stack_vals', 'stack_types')
 
 
     @classmethod
-    def add_variable(cls, var_name: str):
-        """Adds variable to frame
+    def reset(cls):
+        """Remove state of previously executed program
+
+        Settings given by arguments are kept, so another program can be
+        loaded and executed in the same process.
+
+        """
+        cls.input_file = None
+        cls._stdin_reader = None
+        cls.source_file = None
+        cls.source_stream = None
+        cls.ins_performed = 0
+        cls.global_layout = FrameLayout()
+        cls.local_layout = FrameLayout()
+        cls.global_frame = None
+        cls.temp_frame = None
+        cls.local_frame = None
+        cls.frame_pool = []
+        cls.labels = {}
+        cls.undef_labels = set()
+        cls.stack_func = []
+        cls.stack_frames = []
+        cls.stack_vals = []
+        cls.stack_types = []
+
 
-        Checks variable name's prefix and decides, to which frame new variable
-        has to be inserted.
+    @classmethod
+    def save_runtime_state(cls) -> dict:
+        """Return whole state of executed program
+
+        Programs executed alternately in one process (AsyncInterpreter)
+        swap their states in CoreData.
+
+        Returns:
+        dict: Values of RUNTIME_STATE attributes
+        """
+        return {name: getattr(cls, name) for name in cls.RUNTIME_STATE}
+
+
+    @classmethod
+    def restore_runtime_state(cls, state: dict):
+        """Continue program with the state returned by save_runtime_state()
 
         Parameters:
-        var_name (str): Variable name
+        state (dict): Values of RUNTIME_STATE attributes
 
         """
-        simplified_name = Variable.simplify_var_name(var_name)
+        for name, value in state.items():
+            setattr(cls, name, value)
 
-        # get frame from variable prefix
-        if var_name.startswith('GF@'):
-            new_var = cls.global_frame.add_variable(simplified_name)
-        elif var_name.startswith('LF@'):
-            if cls.local_frame is None:
-                ErrorCode.exit_error(
-                        f"Error while calling variable {var_name}\n"
-                        "Local frame does not exists.",
-                        ErrorCode.RUNTIME_NONEXIST_FRAME)
-            new_var = cls.local_frame.add_variable(simplified_name)
-        else:
-            if cls.temp_frame is None or not cls.temp_frame.is_active:
-                ErrorCode.exit_error(
-                        f"Error while calling variable {var_name}\n"
-                        "Temporary frame does not exists.",
-                        ErrorCode.RUNTIME_NONEXIST_FRAME)
-            new_var = cls.temp_frame.add_variable(simplified_name)
 
-        if new_var is None:
-            ErrorCode.exit_error(
-                    "Error while creating new variable:\n"
-                    f"Variable {var_name} already exists",
-                    ErrorCode.SEMANTIC_ERROR)
+    @classmethod
+    def save_program_state(cls) -> tuple:
+        """Return state of loaded program shared by many runs
+
+        Returns:
+        tuple: Labels, frame layouts and objects referenced by compiled
+            instructions (global frame and stacks)
+        """
+        return (cls.labels, cls.global_layout, cls.local_layout,
+                cls.global_frame, cls.stack_func, cls.stack_frames,
+                cls.stack_vals, cls.stack_types)
+
 
     @classmethod
-    def get_variable(cls, var_name: str) -> Variable:
-        """Returns stored variable from frame
+    def restore_program_state(cls, state: tuple):
+        """Use state of loaded program in a new run
+
+        Compiled instructions keep references to the global frame slots
+        and to the stacks, so they are emptied in place.
 
-        Check variable name's prefix and decides, which frame to look in for.
-        Terminate program with ErrorCode.RUNTIME_NONEXIST_FRAME if frame is
-        not initialized.
-        Terminate program with ErrorCode.RUNTIME_UNDEF_VAR if variable was not
-        defined within the frame.
+        Parameters:
+        state (tuple): State returned by save_program_state()
+
+        """
+        (cls.labels, cls.global_layout, cls.local_layout,
+         cls.global_frame, cls.stack_func, cls.stack_frames,
+         cls.stack_vals, cls.stack_types) = state
+        slots = cls.global_frame.slots
+        slots[:] = [None] * len(slots)
+        for stack in (cls.stack_func, cls.stack_frames, cls.stack_vals,
+                      cls.stack_types):
+            stack.clear()
+
+
+    @classmethod
+    def resolve_var(cls, var_name: str):
+        """Resolve variable's name into its frame and slot index
 
         Parameters:
         var_name (str): Variable name
 
-        Returs:
-        Variable: Found Variable instance
+        Returns:
+        str, int: Frame prefix ('GF', 'LF' or 'TF') and slot index of
+            the variable; slot index is None when no DEFVAR defines variable
+            of such name in the frame
         """
+        frame_kind = var_name[:2]
         simplified_name = Variable.simplify_var_name(var_name)
-        var = None
+        if frame_kind == 'GF':
+            return frame_kind, cls.global_layout.get_slot(simplified_name)
+        return frame_kind, cls.local_layout.get_slot(simplified_name)
 
-        # get frame from variable prefix
-        if var_name.startswith('GF@'):
-            var = cls.global_frame.get_var(simplified_name)
-        elif var_name.startswith('LF@'):
-            if cls.local_frame is None:
-                ErrorCode.exit_error(
-                        f"Error while calling variable {var_name}\n"
-                        "Local frame does not exists.",
-                        ErrorCode.RUNTIME_NONEXIST_FRAME)
-            var = cls.local_frame.get_var(simplified_name)
+
+    @classmethod
+    def _frame_getter(cls, frame_kind: str, var_name: str):
+        """Return function that fetches frame of given kind
+
+        Returned function terminates program with
+        ErrorCode.RUNTIME_NONEXIST_FRAME if frame is not initialized.
+
+        Parameters:
+        frame_kind (str): Frame prefix ('GF', 'LF' or 'TF')
+        var_name (str):   Variable name used in error message
+
+        Returns:
+        function: Function without parameters that returns Frame instance
+
+        """
+        if frame_kind == 'GF':
+            def get_frame():
+                return cls.global_frame
+        elif frame_kind == 'LF':
+            def get_frame():
+                if cls.local_frame is None:
+                    ErrorCode.exit_error(
+                            f"Error while calling variable {var_name}\n"
+                            "Local frame does not exists.",
+                            ErrorCode.RUNTIME_NONEXIST_FRAME)
+                return cls.local_frame
         else:
-            if cls.temp_frame is None or not cls.temp_frame.is_active:
+            def get_frame():
+                if cls.temp_frame is None or not cls.temp_frame.is_active:
+                    ErrorCode.exit_error(
+                            f"Error while calling variable {var_name}\n"
+                            "Temporary frame does not exists.",
+                            ErrorCode.RUNTIME_NONEXIST_FRAME)
+                return cls.temp_frame
+        return get_frame
+
+
+    @classmethod
+    def new_temp_frame(cls) -> Frame:
+        """Replace temporary frame with new empty frame
+
+        Temporary frame which is not on the stack of frames is unreachable
+        after it is replaced, so it is emptied and reused. Otherwise frame
+        released by POPFRAME is reused or new frame is created.
+
+        Returns:
+        Frame: New temporary frame
+        """
+        frame = cls.temp_frame
+        if frame is None or not frame.is_active:
+            if cls.frame_pool:
+                frame = cls.frame_pool.pop()
+            else:
+                frame = Frame(cls.local_layout)
+                cls.temp_frame = frame
+                return frame
+        frame.reset()
+        cls.temp_frame = frame
+        return frame
+
+
+    @classmethod
+    def var_definer(cls, argument: Argument):
+        """Return function that defines variable from argument
+
+        Variable's frame and slot are resolved only once. Returned function
+        checks frame existence and inserts new variable to the frame.
+
+        Parameters:
+        argument (Argument): Argument of type 'var'
+
+        Returns:
+        function: Function without parameters that defines variable
+
+        """
+        var_name = argument.value
+        frame_kind, slot = cls.resolve_var(var_name)
+        get_frame = cls._frame_getter(frame_kind, var_name)
+
+        def define():
+            if get_frame().add_variable(slot) is None:
                 ErrorCode.exit_error(
-                        f"Error while calling variable {var_name}\n"
-                        "Temporary frame does not exists.",
-                        ErrorCode.RUNTIME_NONEXIST_FRAME)
-            var = cls.temp_frame.get_var(simplified_name)
+                        "Error while creating new variable:\n"
+                        f"Variable {var_name} already exists",
+                        ErrorCode.SEMANTIC_ERROR)
+        return define
 
-        if var is None:
+
+    @classmethod
+    def var_getter(cls, argument: Argument):
+        """Return function that fetches stored variable from frame
+
+        Variable's frame and slot are resolved only once. Returned function
+        terminates program with ErrorCode.RUNTIME_NONEXIST_FRAME if frame is
+        not initialized and with ErrorCode.RUNTIME_UNDEF_VAR if variable was
+        not defined within the frame.
+
+        Parameters:
+        argument (Argument): Argument of type 'var'
+
+        Returns:
+        function: Function without parameters that returns Variable instance
+
+        """
+        var_name = argument.value
+        frame_kind, slot = cls.resolve_var(var_name)
+
+        def undefined():
             ErrorCode.exit_error(
                 f"Error: Variable {var_name} has not been defined",
                 ErrorCode.RUNTIME_UNDEF_VAR)
-        return var
+
+        if slot is None:
+            # variable is never defined, fail after frame check
+            get_frame = cls._frame_getter(frame_kind, var_name)
+            def get_var():
+                get_frame()
+                undefined()
+        elif frame_kind == 'GF':
+            global_slots = cls.global_frame.slots
+            def get_var():
+                var = global_slots[slot]
+                if var is None:
+                    undefined()
+                return var
+        elif frame_kind == 'LF':
+            def get_var():
+                frame = cls.local_frame
+                if frame is None:
+                    ErrorCode.exit_error(
+                            f"Error while calling variable {var_name}\n"
+                            "Local frame does not exists.",
+                            ErrorCode.RUNTIME_NONEXIST_FRAME)
+                var = frame.slots[slot]
+                if var is None:
+                    undefined()
+                return var
+        else:
+            def get_var():
+                frame = cls.temp_frame
+                if frame is None or not frame.is_active:
+                    ErrorCode.exit_error(
+                            f"Error while calling variable {var_name}\n"
+                            "Temporary frame does not exists.",
+                            ErrorCode.RUNTIME_NONEXIST_FRAME)
+                var = frame.slots[slot]
+                if var is None:
+                    undefined()
+                return var
+        return get_var
 
 
     @classmethod
-    def get_symbol(cls, argument: Argument) -> Argument:
-        """Return a symbol (variable or constant) from argument
+    def symbol_getter(cls, argument: Argument):
+        """Return function that fetches a symbol (variable or constant)
 
         Parameters:
         argument (Argument): Instance of argument
 
         Returns:
-        Argument: Extracted symbol from argument (variable or constant)
+        function: Function without parameters that returns extracted symbol
+            (Variable instance or constant Argument)
         """
         if argument.type == 'var':
-            var: Variable = cls.get_variable(argument.value)
-            return var
-        return argument
+            return cls.var_getter(argument)
+        return lambda: argument
 
 
     @classmethod
@@ -143,19 +355,19 @@ class CoreData:
 
         """
         if cls.input_file is None:
+            # prompt written by the program has to be visible
+            if Output.interactive_stdin:
+                Output.flush()
+            if cls._stdin_reader is None:
+                cls._stdin_reader = StreamLineReader(
+                        sys.stdin.fileno(), sys.stdin.encoding, sys.stdin.errors)
             try:
-                return input()
-            except:
+                return cls._stdin_reader.readline()
+            except UnicodeDecodeError:
                 return None
 
-        # reading from the file
-        # file content is stored in list, last item is EOF
-        # increase line counter when new line read
-        if cls._line_index < len(cls.input_file):
-            ret = cls.input_file[cls._line_index]
-            cls._line_index += 1
-            return ret
-        return None
+        # reading from the file, lines are decoded when they are read
+        return cls.input_file.readline()
 
 
     @classmethod
@@ -176,6 +388,30 @@ class CoreData:
                 cls.labels[stat.args[0].value] = i+1
 
 
+    @classmethod
+    def set_frames(cls, lof_ins: list):
+        """Assign frame slots to variables
+
+        Every variable defined by DEFVAR instruction gets a slot index in
+        the layout of its frame. Temporary and local frames share one
+        layout, since temporary frame becomes local frame after PUSHFRAME.
+        Global frame is created with final layout.
+
+        Parameters:
+        lof_ins (list): List of instructions (Statement) extracted from XML file
+
+        """
+        for stat in lof_ins:
+            if stat.ins == 'DEFVAR':
+                var_name = stat.args[0].value
+                simplified_name = Variable.simplify_var_name(var_name)
+                if var_name.startswith('GF@'):
+                    cls.global_layout.add_name(simplified_name)
+                else:
+                    cls.local_layout.add_name(simplified_name)
+        cls.global_frame = Frame(cls.global_layout)
+
+
     @classmethod
     def update_label_data(cls, stat: Statement):
         """Update label-instruction related data
@@ -184,10 +420,14 @@ class CoreData:
         stat (Statement): Processing instruction
 
         """
+        # operands are checked after whole program is loaded
+        if len(stat.args) == 0:
+            return
+
         if stat.ins == 'LABEL':
             label_name = stat.args[0].value
             if cls.labels.get(label_name) is not None:
-                sys.exit(ErrorCode.SEMANTIC_ERROR)
+                raise ProgramExit(ErrorCode.SEMANTIC_ERROR)
             cls.labels[label_name] = 0
 
             # remove from undefined label if exists
@@ -201,14 +441,16 @@ class CoreData:
 
 
     @classmethod
-    def stack_push(cls, value):
+    def stack_push(cls, value, value_type: str):
         """Push value to the data stack
 
         Parameters:
-        value (any): Constant value
+        value (any):        Constant value
+        value_type (str):   Data type of the value
 
         """
         cls.stack_vals.append(value)
+        cls.stack_types.append(value_type)
 
 
     @classmethod
@@ -219,11 +461,9 @@ class CoreData:
         stack is empty.
 
         Returns:
-        Variable: Value from stack stored in temporary value
+        any, str: Value from stack and its data type
 
         """
         if len(cls.stack_vals) < 1:
             ErrorCode.exit_error("Stack is empty", ErrorCode.RUNTIME_MISSING_VALUE)
-        temp_var = Variable()
-        temp_var.value = cls.stack_vals.pop()
-        return temp_var
+        return cls.stack_vals.pop(), cls.stack_types.pop()
@@ -5,6 +5,20 @@ File:   error.py
 Module: proj2_module
 """
 import sys
+from .output import Output
+
+
+class ProgramExit(Exception):
+    """Termination of interpreted program
+
+    Raised by EXIT instruction and on errors instead of terminating
+    the whole process, so the caller gets the exit code.
+    """
+
+    def __init__(self, code: int):
+        super().__init__(code)
+        self.code = code
+
 
 class ErrorCode:
     XML_FORMAT_ERROR = 31
@@ -25,11 +39,14 @@ class ErrorCode:
     def exit_error(msg: str, error_code: int):
         """Print error message to stderr and terminate program with given value
 
+        Program is terminated by ProgramExit exception.
+
         Parameters:
         msg (str):          Error message
         error_code (int):   Error code
 
         """
+        Output.flush()
         sys.stderr.write(msg)
         sys.stderr.write('\n')
-        sys.exit(error_code)
+        raise ProgramExit(error_code)
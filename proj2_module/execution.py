@@ -0,0 +1,153 @@
+"""Execution of the program given by interpreter settings
+
+Program is loaded (from XML source or compiled image), translated by the
+selected engine and executed by the main loop. All settings are taken
+from CoreData, so the same function serves single runs and batch mode.
+Program executed many times can be loaded and translated only once
+(see load_shared_program).
+
+Author: Hung Do
+File:   execution.py
+Module: proj2_module
+"""
+import gc
+import sys
+from .coredata import CoreData
+from .output import Output
+from .instruction_set import compile_program
+from .program_image import load_program, parse_program, write_image
+from .codegen import compile_codegen
+from .lazy_loader import compile_lazy
+from .profiler import Profiler
+from .stats import Statistics
+from .sampler import SamplingProfiler
+
+
+def translate_program(lof_ins: list, count_ins: bool, fuse: bool) -> list:
+    """Translate program by the selected engine
+
+    Parameters:
+    lof_ins (list):     Sorted list of instructions (Statement)
+    count_ins (bool):   Count executed instructions
+    fuse (bool):        Use superinstructions
+
+    Returns:
+    list: Instructions; index of the instruction in the list is its
+        program counter value
+    """
+    if CoreData.engine == 'codegen':
+        # basic blocks compiled to Python functions
+        return compile_codegen(lof_ins, count_ins, CoreData.codegen_cache)
+    if CoreData.lazy_decode:
+        # instructions are decoded and built on their first execution
+        return compile_lazy(lof_ins)
+    # pre-bind instructions with their operands
+    return compile_program(lof_ins, fuse=fuse)
+
+
+def load_shared_program() -> tuple:
+    """Load and translate program for many runs
+
+    Translated instructions are reused by every run, state referenced
+    by them is emptied before the run (CoreData.restore_program_state).
+    Lazily decoded program is translated in every run.
+
+    Returns:
+    tuple: Instructions (Statement), translated instructions (None if
+        they cannot be shared), counting of executed instructions
+        and state of the program
+    """
+    lof_ins = load_program()
+    count_ins = any(stat.ins == 'BREAK' for stat in lof_ins)
+    code = None
+    if not CoreData.lazy_decode:
+        code = translate_program(lof_ins, count_ins, fuse=not count_ins)
+    return lof_ins, code, count_ins, CoreData.save_program_state()
+
+
+def execute_program() -> int:
+    """Load and execute program
+
+    Program terminates by ProgramExit on error or EXIT instruction.
+
+    Returns:
+    int: Exit code of the program which reached its end
+    """
+    # loaded program lives until the end of the run, collector would only
+    # traverse its structures again and again while they are being built
+    gc.disable()
+
+    if CoreData.compile_only is not None:
+        write_image(CoreData.compile_only, parse_program())
+        return 0
+
+    shared_code = None
+    if CoreData.loaded_program is not None:
+        # program loaded by Interpreter.load, instructions are not iterated
+        # again, so forked workers don't copy their memory
+        lof_ins, shared_code, count_ins, state = CoreData.loaded_program
+        CoreData.restore_program_state(state)
+    else:
+        # XML parsing and sorting commands (or loading of compiled image)
+        lof_ins = load_program()
+        # counter is only observable through BREAK instruction,
+        # superinstructions would hide some of executed instructions
+        count_ins = any(stat.ins == 'BREAK' for stat in lof_ins)
+    profile = CoreData.profile_file is not None
+    stats = Statistics(lof_ins, CoreData.stats_groups) if CoreData.stats_groups else None
+
+    if shared_code is not None and not (profile or stats):
+        code = shared_code
+    else:
+        code = translate_program(lof_ins, count_ins,
+                                 fuse=not (count_ins or profile or stats))
+
+    profiler = None
+    if profile:
+        # every instruction is wrapped, no check is needed in the main loop
+        profiler = Profiler(lof_ins)
+        code = profiler.wrap(code)
+    gc.freeze()
+    gc.enable()
+
+    # execute program (commands)
+    nof_ins = len(code)
+    ins_index = 0
+    sampler = None
+    if CoreData.sample_file is not None:
+        # samples are taken by signal handler, main loop stays the same
+        sampler = SamplingProfiler(lof_ins, CoreData.sample_interval)
+        sampler.start(sys._getframe())
+    try:
+        if stats is not None:
+            # executions are counted for every instruction
+            counts = stats.counts
+            hooks = stats.hooks
+            while ins_index < nof_ins:
+                hook = hooks[ins_index]
+                if hook is not None:
+                    hook()
+                counts[ins_index] += 1
+                ins_index = code[ins_index]()
+                CoreData.ins_performed += 1
+        elif count_ins and CoreData.engine != 'codegen':
+            # generated blocks count their instructions themselves
+            while ins_index < nof_ins:
+                ins_index = code[ins_index]()
+                CoreData.ins_performed += 1
+        else:
+            while ins_index < nof_ins:
+                ins_index = code[ins_index]()
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        # written output is not lost even if interpreter fails
+        Output.flush()
+        if profiler is not None:
+            profiler.write(CoreData.profile_file)
+        if stats is not None:
+            stats.write()
+        if sampler is not None:
+            sampler.write(CoreData.sample_file)
+
+    return 0
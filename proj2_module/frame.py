@@ -4,33 +4,49 @@ Author: Hung Do
 File:   statement.py
 Module: proj2_module
 """
-import sys
-import re
-from .error import ErrorCode
+from .error import ErrorCode, ProgramExit
 from .statement import Argument
+from .string_buffer import StringBuffer
+
+# data types of Python values stored in variables
+VALUE_TYPES = {
+        type(None): 'nil',
+        bool: 'bool',
+        int: 'int',
+        str: 'string',
+        float: 'float',
+        }
+
 
 class Variable(Argument):
+    __slots__ = ()
 
     def __init__(self):
-        super().__init__()
+        self._type = 'UNDEF'
+        self._value = None
+
+
+    @property
+    def value(self):
+        """Value of the variable; string buffer is returned as str"""
+        value = self._value
+        if value.__class__ is StringBuffer:
+            return value.text
+        return value
 
 
-    @Argument.value.setter
+    @value.setter
     def value(self, value):
         """Set new value and data type acording to that"""
+        value_type = VALUE_TYPES.get(value.__class__)
+        if value_type is None:
+            if value.__class__ is not StringBuffer:
+                raise ProgramExit(ErrorCode.UNDEFINED_ERROR)
+            # buffer of another variable, store its current value
+            value = value.text
+            value_type = 'string'
         self._value = value
-        if value is None:
-            self._type = 'nil'
-        elif isinstance(value, bool):
-            self._type = 'bool'
-        elif isinstance(value, int):
-            self._type = 'int'
-        elif isinstance(value, str):
-            self._type = 'string'
-        elif isinstance(value, float):
-            self._type = 'float'
-        else:
-            sys.exit(ErrorCode.UNDEFINED_ERROR)
+        self._type = value_type
 
 
     @staticmethod
@@ -44,47 +60,107 @@ class Variable(Argument):
         str: Variable's name without prefix
 
         """
-        return re.sub("^(GF|LF|TF)@", "", var_name)
+        if var_name[:3] in ('GF@', 'LF@', 'TF@'):
+            return var_name[3:]
+        return var_name
 
 
-class Frame:
+class FrameLayout:
+    __slots__ = ('names', '_slots')
 
     def __init__(self):
+        self.names = []
+        self._slots = {}
+
+
+    def __len__(self):
+        return len(self.names)
+
+
+    def add_name(self, var_name: str) -> int:
+        """Assigns slot to variable's name if it doesn't have one yet
+
+        Parameters:
+        var_name (str): Variable's name (without prefix)
+
+        Returns:
+        int: Slot index of the variable
+
+        """
+        slot = self._slots.get(var_name)
+        if slot is None:
+            slot = len(self.names)
+            self._slots[var_name] = slot
+            self.names.append(var_name)
+        return slot
+
+
+    def get_slot(self, var_name: str):
+        """Returns slot index of the variable
+
+        Parameters:
+        var_name (str): Variable's name (without prefix)
+
+        Returns:
+        int: Slot index; None if variable is never defined in this layout
+
+        """
+        return self._slots.get(var_name)
+
+
+class Frame:
+    __slots__ = ('is_active', '_layout', 'slots')
+
+    def __init__(self, layout: FrameLayout):
+        self.is_active = True
+        self._layout = layout
+        self.slots = [None] * len(layout)
+
+
+    def reset(self):
+        """Removes all variables, so the frame can be used as a new one"""
         self.is_active = True
-        self._vars = {}
+        self.slots = [None] * len(self.slots)
 
 
     @property
     def vars(self):
-        return self._vars
+        return {name: var for name, var in zip(self._layout.names, self.slots)
+                if var is not None}
 
 
-    def add_variable(self, var_name: str):
+    def add_variable(self, slot: int):
         """Adds new variable to the frame
 
         Parameters:
-        var_name (str): Variable's name
+        slot (int): Variable's slot index
 
         Returns:
         Variable: Instance of Variable when new variable was successfully added
             None otherwise
         """
         # check if variable exists
-        if self._vars.get(var_name) is not None:
+        if self.slots[slot] is not None:
             return None
         new_var = Variable()
-        self._vars[var_name] = new_var
+        self.slots[slot] = new_var
         return new_var
 
 
-    def get_var(self, var_name: str):
+    def count_initialized(self) -> int:
+        """Returns number of variables with assigned value"""
+        return sum(1 for var in self.slots
+                   if var is not None and var._type != 'UNDEF')
+
+
+    def get_var(self, slot: int):
         """Returns variable instance in the frame.
 
         Parameters:
-        var_name (str): Variable's name
+        slot (int): Variable's slot index
 
         Returns:
         bool: Variable instance if exists; None if no instance was found.
 
         """
-        return self._vars.get(var_name)
+        return self.slots[slot]
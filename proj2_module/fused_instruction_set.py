@@ -0,0 +1,222 @@
+"""Superinstructions for frequent sequences of instructions
+
+All functions in this file take three parameters:
+    prg_cntr (int): Index of the first instruction of the sequence
+    stats (list):   Instructions (Statement) of the sequence
+    parts (list):   Already built instructions of the sequence
+
+All functions return:
+    function: Pre-bound instruction executing whole sequence at once and
+        returning updated program counter; None if operands of the sequence
+        don't match the pattern
+
+Fused instruction replaces only the first instruction of the sequence,
+the rest stays in the program, so jumps inside of the sequence still work.
+
+Author: Hung Do
+File:   fused_instruction_set.py
+Module: proj2_module
+"""
+import operator
+from .error import ErrorCode
+from .coredata import CoreData
+from .frame import Variable
+
+COMPARISONS = {
+        'LT': operator.lt,
+        'GT': operator.gt,
+        'EQ': operator.eq,
+        }
+
+STACK_ARITHMETIC = {
+        'ADDS': operator.add,
+        'SUBS': operator.sub,
+        'MULS': operator.mul,
+        }
+
+
+def compare_and_jump(prg_cntr: int, stats: list, parts: list):
+    """ LT/GT/EQ <var> <symb1> <symb2>
+        JUMPIFEQ/JUMPIFNEQ <label> <var> bool@<value>
+    """
+    compare, jump = stats
+    if (jump.args[1].type != 'var' or jump.args[1].value != compare.args[0].value
+        or jump.args[2].type != 'bool'):
+        return None
+
+    # value of comparison which leads to the jump
+    jump_when = jump.args[2].value
+    if jump.ins == 'JUMPIFNEQ':
+        jump_when = not jump_when
+
+    target = CoreData.labels[jump.args[0].value]
+    get_var = CoreData.var_getter(compare.args[0])
+    next_ins = prg_cntr + 2
+    types = compare.types or (None, None, None)
+
+    if compare.ins == 'EQ':
+        proven = (types[1] is not None and types[2] is not None
+                  and (types[1] == types[2] or 'nil' in types[1:]))
+    else:
+        proven = types[1] not in (None, 'nil') and types[1] == types[2]
+
+    if not proven:
+        run_compare = parts[0]
+        def run():
+            run_compare()
+            return target if get_var()._value is jump_when else next_ins
+        return run
+
+    operation = COMPARISONS[compare.ins]
+    get_op1 = CoreData.symbol_getter(compare.args[1])
+    get_op2 = CoreData.symbol_getter(compare.args[2])
+
+    def run():
+        var: Variable = get_var()
+        result = operation(get_op1()._value, get_op2()._value)
+        var._value = result
+        var._type = 'bool'
+        return target if result is jump_when else next_ins
+    return run
+
+
+def step_and_jump(prg_cntr: int, stats: list, parts: list):
+    """ ADD/SUB <var> <var> int@<value>
+        JUMP <label>
+    """
+    step, jump = stats
+    if step.args[0].value != step.args[1].value or step.args[2].type != 'int':
+        return None
+
+    target = CoreData.labels[jump.args[0].value]
+    if step.types is None or step.types[1] != 'int':
+        run_step = parts[0]
+        def run():
+            run_step()
+            return target
+        return run
+
+    get_var = CoreData.var_getter(step.args[0])
+    value = step.args[2].value
+    if step.ins == 'SUB':
+        value = -value
+
+    def run():
+        get_var()._value += value
+        return target
+    return run
+
+
+def stack_arithmetic(prg_cntr: int, stats: list, parts: list):
+    """ PUSHS <symb1>
+        PUSHS <symb2>
+        ADDS/SUBS/MULS
+        POPS <var>
+    """
+    if stats[2].ins not in STACK_ARITHMETIC:
+        return None
+
+    operation = STACK_ARITHMETIC[stats[2].ins]
+    get_op1 = CoreData.symbol_getter(stats[0].args[0])
+    get_op2 = CoreData.symbol_getter(stats[1].args[0])
+    get_var = CoreData.var_getter(stats[3].args[0])
+    next_ins = prg_cntr + 4
+
+    def run():
+        op1 = get_op1()
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        op2 = get_op2()
+        if op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+2}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+3}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var: Variable = get_var()
+        var._value = operation(op1._value, op2._value)
+        var._type = op1.type
+        return next_ins
+    return run
+
+
+def createframe_pushframe(prg_cntr: int, stats: list, parts: list):
+    """ CREATEFRAME
+        PUSHFRAME
+    """
+    new_temp_frame = CoreData.new_temp_frame
+    stack_frames = CoreData.stack_frames
+    next_ins = prg_cntr + 2
+
+    def run():
+        frame = new_temp_frame()
+        frame.is_active = False
+        stack_frames.append(frame)
+        CoreData.local_frame = frame
+        return next_ins
+    return run
+
+
+def popframe_return(prg_cntr: int, stats: list, parts: list):
+    """ POPFRAME
+        RETURN
+    """
+    run_popframe, run_return = parts
+
+    def run():
+        run_popframe()
+        return run_return()
+    return run
+
+
+fused_instruct_set = {
+        ('PUSHS', 'PUSHS', 'ADDS', 'POPS'): stack_arithmetic,
+        ('PUSHS', 'PUSHS', 'SUBS', 'POPS'): stack_arithmetic,
+        ('PUSHS', 'PUSHS', 'MULS', 'POPS'): stack_arithmetic,
+        ('LT', 'JUMPIFEQ'): compare_and_jump,
+        ('GT', 'JUMPIFEQ'): compare_and_jump,
+        ('EQ', 'JUMPIFEQ'): compare_and_jump,
+        ('LT', 'JUMPIFNEQ'): compare_and_jump,
+        ('GT', 'JUMPIFNEQ'): compare_and_jump,
+        ('EQ', 'JUMPIFNEQ'): compare_and_jump,
+        ('ADD', 'JUMP'): step_and_jump,
+        ('SUB', 'JUMP'): step_and_jump,
+        ('CREATEFRAME', 'PUSHFRAME'): createframe_pushframe,
+        ('POPFRAME', 'RETURN'): popframe_return,
+        }
+
+
+def fuse_instructions(lof_ins: list, code: list):
+    """Replace first instructions of known sequences with superinstructions
+
+    Longer sequences are matched first, matched sequences don't overlap.
+
+    Parameters:
+    lof_ins (list): Sorted list of instructions (Statement)
+    code (list):    Pre-bound instructions, updated in place
+
+    """
+    patterns = sorted(fused_instruct_set, key=len, reverse=True)
+    opcodes = [stat.ins for stat in lof_ins]
+    prg_cntr = 0
+    while prg_cntr < len(lof_ins):
+        fused_len = 1
+        for pattern in patterns:
+            end = prg_cntr + len(pattern)
+            if tuple(opcodes[prg_cntr:end]) != pattern:
+                continue
+            fused = fused_instruct_set[pattern](
+                    prg_cntr, lof_ins[prg_cntr:end], code[prg_cntr:end])
+            if fused is not None:
+                code[prg_cntr] = fused
+                fused_len = len(pattern)
+                break
+        prg_cntr += fused_len
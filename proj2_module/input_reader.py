@@ -0,0 +1,165 @@
+"""Line readers for READ instruction
+
+Input is never loaded as a whole. Input file is memory-mapped and lines
+are decoded one by one when READ asks for them. Standard input is read
+in large binary chunks by a background thread, the number of prefetched
+chunks is limited, so memory usage doesn't depend on the size of input.
+Input given as a file object by embedding code is read line by line.
+
+File reader recognizes the same line endings as a file opened in text
+mode ('\\n', '\\r\\n' and '\\r'). Stdin and file objects are split
+by '\\n' only and '\\r' is kept, the same as by input().
+
+Author: Hung Do
+File:   input_reader.py
+Module: proj2_module
+"""
+import locale
+import mmap
+import os
+import queue
+import threading
+
+class FileLineReader:
+    """Lines of memory-mapped file
+
+    Lines are the same as items of content.split('\\n'), so text after
+    the last line ending (even empty one) is returned as the last line.
+    """
+
+    def __init__(self, path: str):
+        self._encoding = locale.getpreferredencoding(False)
+        with open(path, 'rb') as _f:
+            size = os.fstat(_f.fileno()).st_size
+            if size > 0:
+                self._data = mmap.mmap(_f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._data = b''
+        self._size = size
+        self._pos = 0
+
+
+    def readline(self) -> str:
+        """Return next line without line ending
+
+        Returns:
+        str: Read line; None when all lines were read
+        """
+        data = self._data
+        pos = self._pos
+        if pos > self._size:
+            return None
+
+        end = data.find(b'\n', pos)
+        cr_end = data.find(b'\r', pos, self._size if end < 0 else end)
+        if cr_end >= 0:
+            end = cr_end
+            self._pos = end + 2 if data[end + 1:end + 2] == b'\n' else end + 1
+        elif end >= 0:
+            self._pos = end + 1
+        else:
+            # last line, reader is exhausted after it
+            end = self._size
+            self._pos = self._size + 1
+        return data[pos:end].decode(self._encoding)
+
+
+class StreamLineReader:
+    """Lines of binary stream read in chunks by background thread
+
+    Lines are the same as lines returned by input(), so reading ends with
+    the last line ending or with the last unterminated line.
+    """
+    CHUNK_SIZE = 1 << 20
+    # chunks read ahead
+    PREFETCH = 4
+
+    def __init__(self, fd: int, encoding: str, errors: str='strict'):
+        self._encoding = encoding
+        self._errors = errors
+        self._chunk = b''
+        self._pos = 0
+        self._eof = False
+        self._chunks = queue.Queue(self.PREFETCH)
+        thread = threading.Thread(target=self._prefetch, args=(fd,), daemon=True)
+        thread.start()
+
+
+    def _prefetch(self, fd: int):
+        """Read chunks of the stream until its end (empty chunk)"""
+        while True:
+            try:
+                chunk = os.read(fd, self.CHUNK_SIZE)
+            except OSError:
+                chunk = b''
+            self._chunks.put(chunk)
+            if not chunk:
+                return
+
+
+    def _next_chunk(self) -> bool:
+        """Append next chunk to unread data
+
+        Returns:
+        bool: False at the end of the stream otherwise True
+        """
+        if self._eof:
+            return False
+        chunk = self._chunks.get()
+        if not chunk:
+            self._eof = True
+            return False
+        self._chunk = self._chunk[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+
+    def readline(self) -> str:
+        """Return next line without line ending
+
+        Returns:
+        str: Read line; None at the end of the stream
+        """
+        while True:
+            data = self._chunk
+            pos = self._pos
+            end = data.find(b'\n', pos)
+            if end >= 0:
+                self._pos = end + 1
+                return data[pos:end].decode(self._encoding, self._errors)
+            if not self._next_chunk():
+                break
+
+        # unterminated last line
+        if self._pos >= len(self._chunk):
+            return None
+        line = self._chunk[self._pos:]
+        self._pos = len(self._chunk)
+        return line.decode(self._encoding, self._errors)
+
+
+class ObjectLineReader:
+    """Lines of file object (text or binary) given by embedding code
+
+    Lines are the same as lines returned by input().
+    """
+
+    def __init__(self, stream, encoding: str='utf-8'):
+        self._stream = stream
+        self._encoding = encoding
+
+
+    def readline(self) -> str:
+        """Return next line without line ending
+
+        Returns:
+        str: Read line; None at the end of the stream
+        """
+        line = self._stream.readline()
+        if not line:
+            return None
+        if isinstance(line, bytes):
+            line = line.decode(self._encoding)
+        if line.endswith('\n'):
+            line = line[:-1]
+        return line
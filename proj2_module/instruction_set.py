@@ -1,11 +1,14 @@
 """Definition of instruction set of IPPcode22 (without stack operations)
 
 All functions in this file take two parameters:
-    prg_cntr (int): Value of current instruction pointer (program counter)
-    args (list):     List of arguments of given command/statement
+    prg_cntr (int): Index of the instruction in sorted list of instructions
+    args (list):     List of arguments of given command/statement, checked
+                     against instruction's signature (see verifier.py)
 
 All functions return:
-    int: Updated program counter
+    function: Pre-bound instruction without parameters. Operands are resolved
+        when the instruction is built, calling it executes the instruction and
+        returns updated program counter.
 
 Author: Hung Do
 File:   instruction_set.py
@@ -13,374 +16,384 @@ Module: proj2_module
 """
 import re
 import sys
-from .error import ErrorCode
+from .error import ErrorCode, ProgramExit
 from .coredata import CoreData
-from .frame import Frame, Variable
+from .frame import Variable
+from .output import Output
+from .string_buffer import buffer_append, buffer_setchar
 from .stack_instruction_set import *
+from .typed_instruction_set import typed_instruct_set
+from .fused_instruction_set import fuse_instructions
 
 
 def move(prg_cntr: int, args: list):
     """ Move value <symb> to <var>
         MOVE <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
 
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
 
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
 
-    var.value = op1.value
-    return prg_cntr + 1
+        var.value = op1.value
+        return next_ins
+    return run
 
 
 def createframe(prg_cntr: int, args: list):
     """ Creates temporary frame """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    next_ins = prg_cntr + 1
 
-    CoreData.temp_frame = Frame()
-    return prg_cntr + 1
+    new_temp_frame = CoreData.new_temp_frame
+
+    def run():
+        new_temp_frame()
+        return next_ins
+    return run
 
 
 def pushframe(prg_cntr: int, args: list):
     """ Push temporary frame to stack of frames """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    next_ins = prg_cntr + 1
 
-    if CoreData.temp_frame is None or not CoreData.temp_frame.is_active:
-        ErrorCode.exit_error(f"Cannot push non-existing frame at {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_NONEXIST_FRAME)
+    def run():
+        if CoreData.temp_frame is None or not CoreData.temp_frame.is_active:
+            ErrorCode.exit_error(f"Cannot push non-existing frame at {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_NONEXIST_FRAME)
 
-    CoreData.stack_frames.append(CoreData.temp_frame)
-    CoreData.temp_frame.is_active = False
-    CoreData.local_frame = CoreData.temp_frame
-    return prg_cntr + 1
+        CoreData.stack_frames.append(CoreData.temp_frame)
+        CoreData.temp_frame.is_active = False
+        CoreData.local_frame = CoreData.temp_frame
+        return next_ins
+    return run
 
 
 def popframe(prg_cntr: int, args: list):
     """ Pop frame from stack of frames to temporary frame """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    if len(CoreData.stack_frames) == 0:
-        ErrorCode.exit_error(f"No frame to pop at {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_NONEXIST_FRAME)
-
-    CoreData.temp_frame = CoreData.stack_frames.pop()
-    CoreData.temp_frame.is_active = True
-    # set local frame
-    if len(CoreData.stack_frames) == 0:
-        # ErrorCode.exit_error(f"No frame to pop at {prg_cntr+1}. command",
-        #                      ErrorCode.RUNTIME_NONEXIST_FRAME)
-        CoreData.local_frame = None
-    else:
-        CoreData.local_frame = CoreData.stack_frames[-1]
-    return prg_cntr + 1
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(CoreData.stack_frames) == 0:
+            ErrorCode.exit_error(f"No frame to pop at {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_NONEXIST_FRAME)
+
+        # replaced temporary frame is unreachable, keep it for CREATEFRAME
+        if CoreData.temp_frame is not None and CoreData.temp_frame.is_active:
+            CoreData.frame_pool.append(CoreData.temp_frame)
+        CoreData.temp_frame = CoreData.stack_frames.pop()
+        CoreData.temp_frame.is_active = True
+        # set local frame
+        if len(CoreData.stack_frames) == 0:
+            CoreData.local_frame = None
+        else:
+            CoreData.local_frame = CoreData.stack_frames[-1]
+        return next_ins
+    return run
 
 
 def defvar(prg_cntr: int, args: list):
     """ Define new <var>
         DEFVAR <var>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    define_var = CoreData.var_definer(args[0])
+    next_ins = prg_cntr + 1
 
-    var_name = args[0].value
-    CoreData.add_variable(var_name)
-    return prg_cntr + 1
+    def run():
+        define_var()
+        return next_ins
+    return run
 
 
 def call(prg_cntr: int, args: list):
     """ Jump to <label> while perserving instruction pointer value
         CALL <label>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    lbl_name = args[0].value
-    # if CoreData.labels.get(lbl_name) is None:
-    #     ErrorCode.exit_error(ErrorCode.SEMANTIC_ERROR)
+    # jump on the label itself
+    target = CoreData.labels[args[0].value] - 1
+    stack_func = CoreData.stack_func
 
-    CoreData.stack_func.append(prg_cntr)
-    return CoreData.labels[lbl_name] - 1
+    def run():
+        stack_func.append(prg_cntr)
+        return target
+    return run
 
 
 def return_i(prg_cntr: int, args: list):
     """ Jump back to stored instruction pointer value """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_func = CoreData.stack_func
 
-    if len(CoreData.stack_func) == 0:
-        ErrorCode.exit_error(
-                f"""Return call from non-existing function while executing {prg_cntr+1}. command""",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+    def run():
+        if len(stack_func) == 0:
+            ErrorCode.exit_error(
+                    f"""Return call from non-existing function while executing {prg_cntr+1}. command""",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
 
-    prg_cntr = CoreData.stack_func.pop()
-    return prg_cntr + 1
+        return stack_func.pop() + 1
+    return run
 
 
 def add(prg_cntr: int, args: list):
     """ Add two numbers and store in <var>
         ADD <var> <symb> <symb>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value + op2.value
-
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value + op2.value
+        return next_ins
+    return run
 
 
 def sub(prg_cntr: int, args: list):
     """ Subtract two numbers and store in <var>
         SUB <var> <symb> <symb>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value - op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value - op2.value
+        return next_ins
+    return run
 
 
 def mul(prg_cntr: int, args: list):
     """ Multiply two numbers and store in <var>
         MUL <var> <symb> <symb>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value * op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value * op2.value
+        return next_ins
+    return run
 
 
 def div(prg_cntr: int, args: list):
     """ Divide two numbers and store in <var>
         DIV <var> <symb> <symb>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # div zero check
-    if op2.value == 0:
-        ErrorCode.exit_error(f"Cannot divide by zero at {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_WRONG_VALUE)
-
-    var.value = op1.value / op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # div zero check
+        if op2.value == 0:
+            ErrorCode.exit_error(f"Cannot divide by zero at {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_WRONG_VALUE)
+
+        var.value = op1.value / op2.value
+        return next_ins
+    return run
 
 
 def idiv(prg_cntr: int, args: list):
     """ Divide two numbers and store in <var> round down value
         IDIV <var> <symb> <symb>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # div zero check
-    if op2.value == 0:
-        ErrorCode.exit_error(f"Cannot divide by zero at {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_WRONG_VALUE)
-
-    var.value = op1.value // op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
+            or op1.type != op2.type):
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # div zero check
+        if op2.value == 0:
+            ErrorCode.exit_error(f"Cannot divide by zero at {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_WRONG_VALUE)
+
+        var.value = op1.value // op2.value
+        return next_ins
+    return run
 
 
 def lt(prg_cntr: int, args: list):
     """ Check if <symb1> is less than <symb2>; store in <var>
         LT <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type == 'nil' or op2.type == 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-    if op1.type != op2.type:
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value < op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type == 'nil' or op2.type == 'nil' or op1.type != op2.type:
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value < op2.value
+        return next_ins
+    return run
 
 
 def gt(prg_cntr: int, args: list):
     """ Check if <symb1> is greater than <symb2>; store in <var>
         GT <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type == 'nil' or op2.type == 'nil' or op1.type != op2.type:
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value > op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type == 'nil' or op2.type == 'nil' or op1.type != op2.type:
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value > op2.value
+        return next_ins
+    return run
 
 
 def eq(prg_cntr: int, args: list):
     """ Check if <symb1> and <symb2> values are equal; store in <var>
         EQ <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value == op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value == op2.value
+        return next_ins
+    return run
 
 
 def and_i(prg_cntr: int, args: list):
@@ -388,28 +401,30 @@ def and_i(prg_cntr: int, args: list):
             otherwise store 'false'
         AND <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool' or op2.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value and op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'bool' or op2.type != 'bool':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value and op2.value
+        return next_ins
+    return run
 
 
 def or_i(prg_cntr: int, args: list):
@@ -417,87 +432,91 @@ def or_i(prg_cntr: int, args: list):
             otherwise store 'true'
         OR <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool' or op2.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value or op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'bool' or op2.type != 'bool':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = op1.value or op2.value
+        return next_ins
+    return run
 
 
 def not_i(prg_cntr: int, args: list):
     """ Negate <symb> value and store in <var>
         NOT <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = not op1.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'bool':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = not op1.value
+        return next_ins
+    return run
 
 
 def int2char(prg_cntr: int, args: list):
     """ Convert number <symb> to ascii value character
         INT2CHAR <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # ord function range check
-    if op1.value not in range(UNICODE_MAX_VAL + 1):
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_STRING_HANDLING)
-
-    var.value = chr(op1.value)
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'int':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # ord function range check
+        if op1.value not in range(UNICODE_MAX_VAL + 1):
+            ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_STRING_HANDLING)
+
+        var.value = chr(op1.value)
+        return next_ins
+    return run
 
 
 def stri2int(prg_cntr: int, args: list):
@@ -505,479 +524,487 @@ def stri2int(prg_cntr: int, args: list):
             in <var>
         STRI2INT <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'string' or op2.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # index range check
-    if op2.value not in range(len(op1.value)):
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_STRING_HANDLING)
-
-    var.value = ord(op1.value[op2.value])
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'string' or op2.type != 'int':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # index range check
+        if op2.value not in range(len(op1.value)):
+            ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_STRING_HANDLING)
+
+        var.value = ord(op1.value[op2.value])
+        return next_ins
+    return run
 
 
 def int2float(prg_cntr: int, args: list):
     """ Converts int value <symb> to float and store in <var>
         INT2FLOAT <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = float(op1.value)
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'int':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = float(op1.value)
+        return next_ins
+    return run
 
 
 def float2int(prg_cntr: int, args: list):
     """ Converts float value <symb> to int and store in <var>
         FLOAT2INT <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'float':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = int(op1.value)
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'float':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = int(op1.value)
+        return next_ins
+    return run
 
 
 def read(prg_cntr: int, args: list):
     """ Read from input file <type> and store in <var>
         READ <var> <type>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    get_var = CoreData.var_getter(args[0])
+    # data type
+    data_type = args[1].value
+    next_ins = prg_cntr + 1
 
-    var: Variable = CoreData.get_variable(args[0].value)
+    def run():
+        var: Variable = get_var()
+        input_value = CoreData.get_line()
 
-    # data type
-    op1 = CoreData.get_symbol(args[1])
-    input_value = CoreData.get_line()
-
-    if input_value is None:
-        var.value = None
-    elif op1.value == 'string':
-        var.value = input_value
-    elif op1.value == 'bool':
-        var.value = (input_value.lower() == 'true')
-    elif op1.value == 'int':
-        try:
-            var.value = int(input_value)
-        except:
-            var.value = None
-    elif op1.value == 'float':
-        try:
-            if re.match(CoreData.REG_TYPE['float_hex'], input_value):
-                var.value = float.fromhex(input_value)
-            else:
-                var.value = float(input_value)
-        except:
+        if input_value is None:
             var.value = None
-    else:
-        ErrorCode.exit_error(
-                f"Error while reading input at {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_VALUE)
-
-    return prg_cntr + 1
+        elif data_type == 'string':
+            var.value = input_value
+        elif data_type == 'bool':
+            var.value = (input_value.lower() == 'true')
+        elif data_type == 'int':
+            try:
+                var.value = int(input_value)
+            except:
+                var.value = None
+        else:
+            try:
+                if re.match(CoreData.REG_TYPE['float_hex'], input_value):
+                    var.value = float.fromhex(input_value)
+                else:
+                    var.value = float(input_value)
+            except:
+                var.value = None
+
+        return next_ins
+    return run
 
 
 def write(prg_cntr: int, args: list):
     """ Write to STDIN <symb> value
         WRITE <symb>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    symb = CoreData.get_symbol(args[0])
-
-    if symb.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-
-    if symb.type == 'nil':
-        print('', end='', flush=True)
-    elif symb.type == 'bool':
-        output_msg = 'true' if symb.value else 'false'
-        print(output_msg, end='', flush=True)
-    elif symb.type == 'float':
-        print(float.hex(symb.value), end='', flush=True)
-    else:
-        print(symb.value, end='', flush=True)
-    return prg_cntr + 1
+    get_symb = CoreData.symbol_getter(args[0])
+    write_output = Output.write
+    next_ins = prg_cntr + 1
+
+    def run():
+        symb = get_symb()
+
+        if symb.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+
+        if symb.type == 'nil':
+            pass
+        elif symb.type == 'bool':
+            write_output('true' if symb.value else 'false')
+        elif symb.type == 'float':
+            write_output(float.hex(symb.value))
+        else:
+            write_output(str(symb.value))
+        return next_ins
+    return run
 
 
 def concat(prg_cntr: int, args: list):
     """ Concatenate <symb2> to <symb1>; store in <var>
         CONCAR <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'string' or op2.type != 'string':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = op1.value + op2.value
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    # CONCAT <var> <var> <symb> appends to the variable in place
+    in_place = args[1].type == 'var' and args[1].value == args[0].value
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'string' or op2.type != 'string':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        if in_place:
+            var._value = buffer_append(var._value, op2.value)
+        else:
+            var.value = op1.value + op2.value
+        return next_ins
+    return run
 
 
 def strlen(prg_cntr: int, args: list):
     """ Store string length of <symb> in <var>
         STRLEN <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'string':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    var.value = len(op1.value)
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+
+        # initialization check
+        if op1.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'string':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        var.value = len(op1.value)
+        return next_ins
+    return run
 
 
 def getchar(prg_cntr: int, args: list):
     """ Get character of <symb1> at position <symb2>; store in <var>
         GETCHAR <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'string' or op2.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # index range check
-    if op2.value not in range(len(op1.value)):
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_STRING_HANDLING)
-
-    var.value = op1.value[op2.value]
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if op1.type != 'string' or op2.type != 'int':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # index range check
+        if op2.value not in range(len(op1.value)):
+            ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_STRING_HANDLING)
+
+        var.value = op1.value[op2.value]
+        return next_ins
+    return run
 
 
 def setchar(prg_cntr: int, args: list):
     """ Set character of <symb1> at position <symb2>; store in <var>
         SETCHAR <var> <symb1> <symb2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
-
-    # initialization check
-    if var.type == 'UNDEF' or op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if var.type != 'string' or op1.type != 'int' or op2.type != 'string':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # index range check
-    if op1.value not in range(len(var.value)) or len(op2.value) == 0:
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_STRING_HANDLING)
-
-    # ----- setchar ------
-    new_char = op2.value[0]
-    new_str  = list(var.value)
-    new_str[op1.value] = new_char
-    var.value = ''.join(new_str)
-    # --------------------
-    return prg_cntr + 1
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
+        op2 = get_op2()
+
+        # initialization check
+        if var.type == 'UNDEF' or op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+        # runtime type check
+        if var.type != 'string' or op1.type != 'int' or op2.type != 'string':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
+
+        # index range check (length of string buffer is known without
+        # building the string)
+        if op1.value not in range(len(var._value)) or len(op2.value) == 0:
+            ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                                 ErrorCode.RUNTIME_STRING_HANDLING)
+
+        # character is replaced in place
+        var._value = buffer_setchar(var._value, op1.value, op2.value[0])
+        return next_ins
+    return run
 
 
 def type_i(prg_cntr: int, args: list):
     """ Store type of <symb> in string form in <var>
         TYPE <var> <symb>
     """
-    if len(args) != 2:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
 
-    var: Variable = CoreData.get_variable(args[0].value)
-    op1 = CoreData.get_symbol(args[1])
+    def run():
+        var: Variable = get_var()
+        op1 = get_op1()
 
-    # runtime type check
-    if op1.type == 'UNDEF':
-        var.value = ''
-    else:
-        var.value = op1.type
-    return prg_cntr + 1
+        # runtime type check
+        if op1.type == 'UNDEF':
+            var.value = ''
+        else:
+            var.value = op1.type
+        return next_ins
+    return run
 
 
 def label(prg_cntr: int, args: list):
     """ Label to jump
         LABEL <label>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    next_ins = prg_cntr + 1
 
-    return prg_cntr + 1
+    def run():
+        return next_ins
+    return run
 
 
 def jump(prg_cntr: int, args: list):
     """ Jump to <label>
         JUMP <label>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    lbl_name = args[0].value
+    target = CoreData.labels[args[0].value]
 
-    return CoreData.labels[lbl_name]
+    def run():
+        return target
+    return run
 
 
 def jumpifeq(prg_cntr: int, args: list):
     """ Jump to <label> if <symb1> is equal to <symb2>
         JUMPIFEQ <label> <symb1> <sym2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    target = CoreData.labels[args[0].value]
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
 
-    lbl_name = args[0].value
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
+    def run():
+        op1 = get_op1()
+        op2 = get_op2()
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
 
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
 
-    return CoreData.labels[lbl_name] if op1.value == op2.value else prg_cntr+1
+        return target if op1.value == op2.value else next_ins
+    return run
 
 
 def jumpifneq(prg_cntr: int, args: list):
     """ Jump to <label> if <symb1> is not equal to <symb2>
         JUMPIFNEQ <label> <symb1> <sym2>
     """
-    if len(args) != 3:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    target = CoreData.labels[args[0].value]
+    get_op1 = CoreData.symbol_getter(args[1])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
 
-    lbl_name = args[0].value
-    op1 = CoreData.get_symbol(args[1])
-    op2 = CoreData.get_symbol(args[2])
+    def run():
+        op1 = get_op1()
+        op2 = get_op2()
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+        # initialization check
+        if op1.type == 'UNDEF' or op2.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
 
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
 
-    return CoreData.labels[lbl_name] if op1.value != op2.value else prg_cntr+1
+        return target if op1.value != op2.value else next_ins
+    return run
 
 
 def exit_i(prg_cntr: int, args: list):
     """ Exit program with <symb> value
         EXIT <symb>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    get_symb = CoreData.symbol_getter(args[0])
 
-    symb  = CoreData.get_symbol(args[0])
+    def run():
+        symb = get_symb()
 
-    # initialization check
-    if symb.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+        # initialization check
+        if symb.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
 
-    # runtime type check
-    if symb.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if symb.type != 'int':
+            ErrorCode.exit_error(
+                   f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_WRONG_TYPE)
 
-    # value range check
-    if symb.value not in range(50):
-        ErrorCode.exit_error("Error: expexted output value in range (0-49)",
-                             ErrorCode.RUNTIME_WRONG_VALUE)
+        # value range check
+        if symb.value not in range(50):
+            ErrorCode.exit_error("Error: expexted output value in range (0-49)",
+                                 ErrorCode.RUNTIME_WRONG_VALUE)
 
-    # dead code
-    sys.exit(symb.value)
+        Output.flush()
+        raise ProgramExit(symb.value)
+    return run
 
 
 def dprint(prg_cntr: int, args: list):
     """ Write <symb> value to STDERR
         DPRINT <symb>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    symb = CoreData.get_symbol(args[0])
-
-    # runtime type check
-    if symb.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-
-    if symb.type == 'nil':
-        sys.stderr.write('')
-    elif symb.type == 'bool':
-        output_msg = 'true' if symb.value else 'false'
-        sys.stderr.write(output_msg)
-    else:
-        sys.stderr.write(symb.value)
-    return prg_cntr + 1
+    get_symb = CoreData.symbol_getter(args[0])
+    next_ins = prg_cntr + 1
+
+    def run():
+        symb = get_symb()
+
+        # runtime type check
+        if symb.type == 'UNDEF':
+            ErrorCode.exit_error(
+                    f"Missing value while executing {prg_cntr+1}. command",
+                    ErrorCode.RUNTIME_MISSING_VALUE)
+
+        Output.flush_for_stderr()
+        if symb.type == 'nil':
+            sys.stderr.write('')
+        elif symb.type == 'bool':
+            output_msg = 'true' if symb.value else 'false'
+            sys.stderr.write(output_msg)
+        else:
+            sys.stderr.write(symb.value)
+        return next_ins
+    return run
 
 
 def break_i(prg_cntr: int, args: list):
     """ Write program debug information to STDERR
         BREAK
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-    sys.stderr.write("================================\n")
-    sys.stderr.write(f"Pozice v kodu: {prg_cntr + 1}. \n")
-
-    # item[0] -> var name
-    # item[1] -> var value
-    sys.stderr.write("\nObsah globalniho ramce: \n")
-    for item in CoreData.global_frame.vars.items():
-        sys.stderr.write(f"\t{item[0]}: {item[1]}\n")
-
-    sys.stderr.write("\nObsah lokalniho ramce: \n")
-    for item in CoreData.local_frame.vars.items():
-        sys.stderr.write(f"\t{item[0]}: {item[1]}\n")
-
-    sys.stderr.write("\nObsah docasneho ramce: \n")
-    if CoreData.temp_frame is None or not CoreData.temp_frame.is_active:
-
-        sys.stderr.write("\tDocasny ramec je zatim nedefinovany\n\n")
-    else:
-        for item in CoreData.temp_frame.vars.items():
+    next_ins = prg_cntr + 1
+
+    def run():
+        Output.flush_for_stderr()
+        sys.stderr.write("================================\n")
+        sys.stderr.write(f"Pozice v kodu: {prg_cntr + 1}. \n")
+
+        # item[0] -> var name
+        # item[1] -> var value
+        sys.stderr.write("\nObsah globalniho ramce: \n")
+        for item in CoreData.global_frame.vars.items():
+            sys.stderr.write(f"\t{item[0]}: {item[1]}\n")
+
+        sys.stderr.write("\nObsah lokalniho ramce: \n")
+        for item in CoreData.local_frame.vars.items():
             sys.stderr.write(f"\t{item[0]}: {item[1]}\n")
 
-    sys.stderr.write(f"Pocet vykonanych instrukci: {CoreData.ins_performed}\n")
-    sys.stderr.write("================================\n")
+        sys.stderr.write("\nObsah docasneho ramce: \n")
+        if CoreData.temp_frame is None or not CoreData.temp_frame.is_active:
 
-    return prg_cntr + 1
+            sys.stderr.write("\tDocasny ramec je zatim nedefinovany\n\n")
+        else:
+            for item in CoreData.temp_frame.vars.items():
+                sys.stderr.write(f"\t{item[0]}: {item[1]}\n")
+
+        sys.stderr.write(f"Pocet vykonanych instrukci: {CoreData.ins_performed}\n")
+        sys.stderr.write("================================\n")
+
+        return next_ins
+    return run
 
 
 instruct_set = {
@@ -1039,3 +1066,35 @@ instruct_set = {
         'JUMPIFEQS': jumpifeqs,
         'JUMPIFNEQS': jumpifneqs,
         }
+
+
+def compile_program(lof_ins: list, fuse: bool=True) -> list:
+    """Translate sorted instructions into list of pre-bound instructions
+
+    Every instruction is built only once, so operands, jump destinations
+    and handler lookup are resolved before the program is executed.
+    Instructions with proven operand types (see type_inference.py) are built
+    without runtime type checks when possible.
+
+    Parameters:
+    lof_ins (list): Sorted list of instructions (Statement)
+    fuse (bool):    Replace frequent sequences of instructions with
+                    superinstructions (see fused_instruction_set.py)
+
+    Returns:
+    list: Pre-bound instructions; index of the instruction in the list
+        is its program counter value
+
+    """
+    code = []
+    for prg_cntr, stat in enumerate(lof_ins):
+        ins = None
+        if stat.types is not None and stat.ins in typed_instruct_set:
+            ins = typed_instruct_set[stat.ins](prg_cntr, stat.args, stat.types)
+        if ins is None:
+            ins = instruct_set[stat.ins](prg_cntr, stat.args)
+        code.append(ins)
+
+    if fuse:
+        fuse_instructions(lof_ins, code)
+    return code
@@ -0,0 +1,222 @@
+"""Interpreter usable from Python code
+
+Interpreter keeps its settings and executes any number of programs in one
+process. Program ends by returning its exit code, errors and EXIT never
+terminate the calling process. Program used for many runs can be loaded
+once by Interpreter.load.
+
+State of executed program lives in CoreData (instructions are pre-bound
+to it), so the state is reset before every program and programs of all
+Interpreter instances are executed one at a time.
+
+Usage:
+    interpreter = Interpreter(engine='codegen')
+    exit_code = interpreter.run('program.xml', stdin=io.StringIO('5\\n'),
+                                stdout=output)
+
+Author: Hung Do
+File:   interpreter.py
+Module: proj2_module
+"""
+import gc
+import io
+import os
+import sys
+import threading
+
+from .coredata import CoreData
+from .error import ErrorCode, ProgramExit
+from .output import Output
+from .input_reader import FileLineReader, ObjectLineReader
+from .execution import execute_program, load_shared_program
+
+
+class _TextSink:
+    """Binary stream writing decoded output to a text stream"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+
+    def write(self, data: bytes):
+        self._stream.write(data.decode('utf-8'))
+
+
+    def flush(self):
+        self._stream.flush()
+
+
+class Interpreter:
+    # settings (CoreData attributes) and their default values
+    DEFAULTS = {
+            'engine': 'threaded',
+            'lazy_decode': False,
+            'codegen_cache': None,
+            'image_cache': None,
+            'compile_only': None,
+            'output_buffer': None,
+            'profile_file': None,
+            'stats_groups': (),
+            'sample_file': None,
+            'sample_interval': None,
+            'program_cache': None,
+            'loaded_program': None,
+            }
+
+    # state of the program is shared by the process
+    _lock = threading.Lock()
+
+    def __init__(self, **settings):
+        """
+        Parameters:
+        settings (dict): Values of settings (see Interpreter.DEFAULTS)
+
+        """
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError(f"Unknown interpreter settings: {', '.join(sorted(unknown))}")
+        if settings.get('engine', 'threaded') not in ('threaded', 'codegen'):
+            raise ValueError(f"Unknown engine {settings['engine']}")
+        self.settings = dict(self.DEFAULTS, **settings)
+
+
+    @classmethod
+    def from_arguments(cls, **settings):
+        """Return interpreter with settings stored by arg_process()
+
+        Parameters:
+        settings (dict): Values of settings replacing stored ones
+
+        """
+        stored = {name: getattr(CoreData, name) for name in cls.DEFAULTS}
+        return cls(**dict(stored, **settings))
+
+
+    def run(self, program=None, stdin=None, stdout=None, stderr=None) -> int:
+        """Execute the program
+
+        Parameters:
+        program (str|bytes|file): Path to XML source or program image, XML
+            source itself or binary stream with it; None for stdin
+        stdin (str|file):   Path to input file or file object with input;
+                            None for stdin of the process
+        stdout (file):      Binary or text stream for output of the program;
+                            None for stdout of the process
+        stderr (file):      Text stream for error messages and debug output;
+                            None for stderr of the process
+
+        Returns:
+        int: Exit code of the program
+        """
+        stdout = self._binary_output(stdout)
+
+        with self._lock:
+            self._apply_settings()
+            # objects frozen by the caller (e.g. program shared with forked
+            # workers) must stay frozen
+            frozen = gc.get_freeze_count() > 0
+            real_stderr = sys.stderr
+            if stderr is not None:
+                sys.stderr = stderr
+            try:
+                Output.setup(CoreData.output_buffer, stdout)
+                self._set_source(program)
+                self._set_input(stdin)
+                return execute_program()
+            except ProgramExit as exc:
+                return exc.code
+            finally:
+                Output.flush()
+                Output.stream = None
+                sys.stderr = real_stderr
+                # program may have failed before collector was enabled again
+                gc.enable()
+                if not frozen:
+                    gc.unfreeze()
+
+
+    def load(self, program=None):
+        """Load the program for many runs
+
+        Program is loaded, checked and translated only once, it is shared
+        by all runs of returned interpreter.
+
+        Parameters:
+        program (str|bytes|file): Path to XML source or program image, XML
+            source itself or binary stream with it; None for stdin
+
+        Returns:
+        Interpreter: Interpreter executing the program, its run() ignores
+            argument program
+
+        Raises:
+        ProgramExit: Program cannot be loaded (error message is written
+            to stderr)
+        """
+        with self._lock:
+            self._apply_settings()
+            self._set_source(program)
+            gc.disable()
+            try:
+                loaded_program = load_shared_program()
+            finally:
+                gc.enable()
+        return Interpreter(**dict(self.settings, loaded_program=loaded_program))
+
+
+    def _apply_settings(self, reset: bool=True):
+        """Remove state of previous program and set settings to CoreData
+
+        Parameters:
+        reset (bool): Remove state of previous program
+
+        """
+        if reset:
+            CoreData.reset()
+        for name, value in self.settings.items():
+            setattr(CoreData, name, value)
+
+
+    @staticmethod
+    def _binary_output(stdout):
+        """Return binary stream writing to the output given by the caller"""
+        if not isinstance(stdout, io.TextIOBase):
+            return stdout
+        stdout.flush()
+        if hasattr(stdout, 'buffer'):
+            # sys.stdout and other wrappers of binary streams
+            return stdout.buffer
+        return _TextSink(stdout)
+
+
+    @staticmethod
+    def _set_source(program):
+        """Set source of the program to CoreData"""
+        if program is None:
+            return
+        if isinstance(program, (bytes, bytearray)):
+            CoreData.source_stream = io.BytesIO(program)
+        elif hasattr(program, 'read'):
+            CoreData.source_stream = program
+        else:
+            path = os.fspath(program)
+            if not os.path.exists(path):
+                ErrorCode.exit_error(f"File {path} does not exists!",
+                                     ErrorCode.UNDEFINED_ERROR)
+            CoreData.source_file = path
+
+
+    @staticmethod
+    def _set_input(stdin):
+        """Set input of the program to CoreData"""
+        if stdin is None:
+            return
+        if hasattr(stdin, 'readline'):
+            CoreData.input_file = ObjectLineReader(stdin)
+            return
+        path = os.fspath(stdin)
+        if not os.path.exists(path):
+            ErrorCode.exit_error(f"File {path} does not exists!",
+                                 ErrorCode.UNDEFINED_ERROR)
+        # lines of the file are read when they are needed
+        CoreData.input_file = FileLineReader(path)
@@ -0,0 +1,52 @@
+"""Lazy building of instructions
+
+In lazy mode arguments of instructions are checked and decoded only when
+the instruction is executed for the first time. Every instruction starts
+as a stub that decodes the statement, builds pre-bound instruction,
+replaces itself with it and runs it, so startup time depends only on the
+size of the program and not on the work done for every instruction.
+
+Author: Hung Do
+File:   lazy_loader.py
+Module: proj2_module
+"""
+from .instruction_set import instruct_set
+from .xml_parser import decode_statement
+from .statement import Statement
+
+
+def lazy_instruction(code: list, prg_cntr: int, stat: Statement):
+    """Return stub of instruction that is built on its first execution
+
+    Parameters:
+    code (list):        Program being executed; stub replaces itself in it
+    prg_cntr (int):     Program counter value of the instruction
+    stat (Statement):   Instruction, possibly with undecoded arguments
+
+    Returns:
+    function: Function without parameters that builds and executes
+        the instruction, returns new value of program counter
+    """
+    def run():
+        decode_statement(stat)
+        ins = instruct_set[stat.ins](prg_cntr, stat.args)
+        code[prg_cntr] = ins
+        return ins()
+    return run
+
+
+def compile_lazy(lof_ins: list) -> list:
+    """Translate sorted instructions into list of lazily built instructions
+
+    Parameters:
+    lof_ins (list): Sorted list of instructions (Statement)
+
+    Returns:
+    list: Instruction stubs; index of the instruction in the list
+        is its program counter value
+
+    """
+    code = [None] * len(lof_ins)
+    for prg_cntr, stat in enumerate(lof_ins):
+        code[prg_cntr] = lazy_instruction(code, prg_cntr, stat)
+    return code
@@ -0,0 +1,105 @@
+"""Buffered standard output of the interpreted program
+
+Output of WRITE instructions is collected in a buffer of encoded bytes
+and written to the binary layer of stdout. Buffer is flushed when it is
+full (or at the end of line with line policy), at the end of the program,
+on EXIT, on error and before READ waits for interactive input.
+When stdout and stderr share a destination, output is also flushed
+before anything is written to stderr to keep the right order.
+
+Author: Hung Do
+File:   output.py
+Module: proj2_module
+"""
+import os
+import sys
+
+class Output:
+    DEFAULT_SIZE = 1 << 16
+
+    _buffer = bytearray()
+    _limit = DEFAULT_SIZE
+    _line_flush = False
+    _encoding = 'utf-8'
+    _errors = 'strict'
+
+    shared_stderr = False
+    interactive_stdin = False
+    # binary stream receiving the output; None for stdout
+    stream = None
+
+
+    @classmethod
+    def setup(cls, policy: str=None, stream=None):
+        """Set flush policy and destination of the output
+
+        Parameters:
+        policy (str): 'none' to flush every write, 'line' to flush at the end
+            of line or buffer size in bytes; None to choose line policy
+            for terminal and default size otherwise
+        stream (file): Binary stream receiving the output; None for stdout
+
+        """
+        cls._buffer.clear()
+        cls.stream = stream
+        target = sys.stdout if stream is None else stream
+        if policy is None:
+            try:
+                policy = 'line' if target.isatty() else cls.DEFAULT_SIZE
+            except (ValueError, AttributeError):
+                policy = cls.DEFAULT_SIZE
+        cls._line_flush = policy == 'line'
+        if policy == 'none':
+            cls._limit = 0
+        elif policy == 'line':
+            cls._limit = cls.DEFAULT_SIZE
+        else:
+            cls._limit = int(policy)
+
+        if stream is None:
+            cls._encoding = sys.stdout.encoding or 'utf-8'
+            cls._errors = sys.stdout.errors or 'strict'
+        else:
+            cls._encoding = 'utf-8'
+            cls._errors = 'strict'
+        try:
+            cls.shared_stderr = stream is None and os.path.samestat(
+                    os.fstat(sys.stdout.fileno()), os.fstat(sys.stderr.fileno()))
+        except (OSError, ValueError, AttributeError):
+            cls.shared_stderr = False
+        try:
+            cls.interactive_stdin = sys.stdin.isatty()
+        except (ValueError, AttributeError):
+            cls.interactive_stdin = False
+
+
+    @classmethod
+    def write(cls, text: str):
+        """Append text to the output buffer
+
+        Parameters:
+        text (str): Written text
+
+        """
+        data = text.encode(cls._encoding, cls._errors)
+        cls._buffer += data
+        if len(cls._buffer) >= cls._limit or (cls._line_flush and b'\n' in data):
+            cls.flush()
+
+
+    @classmethod
+    def flush(cls):
+        """Write content of the buffer to stdout"""
+        if not cls._buffer:
+            return
+        stream = cls.stream if cls.stream is not None else sys.stdout.buffer
+        stream.write(cls._buffer)
+        stream.flush()
+        cls._buffer.clear()
+
+
+    @classmethod
+    def flush_for_stderr(cls):
+        """Flush the buffer if stderr shares destination with stdout"""
+        if cls.shared_stderr:
+            cls.flush()
@@ -0,0 +1,181 @@
+"""One program executed with many inputs by pre-forked workers
+
+Program is loaded and checked once (Interpreter.load) and all objects
+of the process are frozen (gc.freeze), so the collector never touches them
+again. Worker processes are forked after that and inherit the loaded
+program copy-on-write, only paths of inputs are sent to them by the task
+queue of the pool. Memory of a worker grows only by data of executed runs.
+
+Without fork (or with one job) runs are executed one by one in the main
+process, still with the program loaded only once.
+
+Inputs are all files in a directory, files matching a glob pattern (a path
+of one file is a pattern matching itself) or files listed in a manifest
+given as @MANIFEST. Results are written to stdout as JSON lines in order
+of inputs or by workers to files next to inputs (INPUT.stdout, INPUT.stderr
+and INPUT.rc with exit code).
+
+Author: Hung Do
+File:   prefork.py
+Module: proj2_module
+"""
+import gc
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+from .error import ErrorCode
+from .interpreter import Interpreter
+from .batch import read_manifest
+
+# suffixes of files with results written next to inputs
+OUTPUT_SUFFIXES = ('.stdout', '.stderr', '.rc')
+# prefix of the path to the manifest
+MANIFEST_PREFIX = '@'
+
+# interpreter with loaded program and output mode, inherited by forked workers
+_interpreter: Interpreter = None
+_write_files = False
+
+
+def discover_inputs(path: str) -> list:
+    """Find input files
+
+    Parameters:
+    path (str): Directory with inputs, glob pattern or @manifest
+
+    Returns:
+    list: Sorted paths of input files (manifest keeps its order)
+    """
+    if path.startswith(MANIFEST_PREFIX):
+        return read_manifest(path[len(MANIFEST_PREFIX):])
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in os.listdir(path)
+                 if not name.startswith('.')]
+    else:
+        paths = glob.glob(path)
+    paths = {path for path in paths if os.path.isfile(path)}
+    # results of previous runs are skipped, other files with these
+    # suffixes are inputs too
+    return sorted(path for path in paths
+                  if not any(path.endswith(suffix) and path[:-len(suffix)] in paths
+                             for suffix in OUTPUT_SUFFIXES))
+
+
+def _write_results(input_path: str, stdout: bytes, stderr: str, exit_code: int):
+    """Write results of the run to files next to the input"""
+    with open(input_path + '.stdout', 'wb') as _f:
+        _f.write(stdout)
+    with open(input_path + '.stderr', 'w') as _f:
+        _f.write(stderr)
+    with open(input_path + '.rc', 'w') as _f:
+        _f.write(f"{exit_code}\n")
+
+
+def _run_input(input_path: str) -> dict:
+    """Execute loaded program with the input
+
+    Parameters:
+    input_path (str): Path to the input file
+
+    Returns:
+    dict: Result of the run (input, exit code, time and outputs; outputs
+        are missing when they are written to files; error when the run
+        failed and results cannot be trusted)
+    """
+    # input listed in the manifest may not exist
+    missing = not os.path.isfile(input_path)
+    stdout = io.BytesIO()
+    stderr = io.StringIO()
+    start = time.perf_counter()
+    try:
+        exit_code = _interpreter.run(None, input_path, stdout, stderr)
+    except Exception:
+        stderr.write(traceback.format_exc())
+        exit_code = ErrorCode.UNDEFINED_ERROR
+    result = {'input': input_path,
+              'exit_code': exit_code,
+              'time': time.perf_counter() - start}
+
+    if not _write_files:
+        result['stdout'] = stdout.getvalue()
+        result['stderr'] = stderr.getvalue()
+    if missing:
+        result['error'] = f"Input file {input_path} does not exist"
+    elif _write_files:
+        try:
+            _write_results(input_path, stdout.getvalue(), stderr.getvalue(), exit_code)
+        except OSError as error:
+            result['error'] = f"Cannot write results of {input_path}: {error.strerror}"
+    return result
+
+
+def run_inputs(interpreter: Interpreter, inputs: list, jobs: int,
+               write_files: bool=False):
+    """Execute loaded program with every input
+
+    Parameters:
+    interpreter (Interpreter):  Interpreter with loaded program
+                                (see Interpreter.load)
+    inputs (list):              Paths to input files
+    jobs (int):                 Number of worker processes
+    write_files (bool):         Workers write outputs to files next to inputs
+
+    Returns:
+    iterator: Results of runs (see _run_input) in order of inputs
+    """
+    global _interpreter, _write_files
+    _interpreter = interpreter
+    _write_files = write_files
+    # forked workers share the program only while nobody writes to it
+    gc.freeze()
+
+    if jobs > 1 and len(inputs) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context('fork').Pool(min(jobs, len(inputs)))
+        try:
+            yield from pool.imap(_run_input, inputs)
+        finally:
+            pool.terminate()
+    else:
+        yield from map(_run_input, inputs)
+
+
+def run_program_inputs(path: str, interpreter: Interpreter, jobs: int,
+                       write_files: bool=False) -> int:
+    """Execute loaded program with all inputs and write results
+
+    Parameters:
+    path (str):                 Directory with inputs, glob pattern
+                                or @manifest
+    interpreter (Interpreter):  Interpreter with loaded program
+    jobs (int):                 Number of worker processes
+    write_files (bool):         Write results to files next to inputs
+                                instead of JSON lines to stdout
+
+    Returns:
+    int: Exit code of the interpreter
+    """
+    try:
+        inputs = discover_inputs(path)
+    except OSError:
+        ErrorCode.exit_error(f"Cannot read inputs from {path}",
+                             ErrorCode.UNDEFINED_ERROR)
+    if not (inputs or path.startswith(MANIFEST_PREFIX) or os.path.exists(path)):
+        ErrorCode.exit_error(f"No input files match {path}",
+                             ErrorCode.UNDEFINED_ERROR)
+
+    exit_code = 0
+    for result in run_inputs(interpreter, inputs, jobs, write_files):
+        if 'error' in result:
+            sys.stderr.write(result['error'] + '\n')
+            exit_code = ErrorCode.UNDEFINED_ERROR
+        if not write_files:
+            result['stdout'] = result['stdout'].decode('utf-8', 'replace')
+            sys.stdout.write(json.dumps(result) + '\n')
+            sys.stdout.flush()
+    return exit_code
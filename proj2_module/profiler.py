@@ -0,0 +1,126 @@
+"""Execution profiler of interpreted programs
+
+Profiler wraps every pre-bound instruction with a function that counts
+its executions and measures their wall time. Instructions are wrapped
+only when profiling is requested, so the main loop is the same as
+without profiling otherwise.
+
+Results are written as JSON (per opcode and per instruction order) and
+the most expensive opcodes and instructions are printed to stderr.
+
+Author: Hung Do
+File:   profiler.py
+Module: proj2_module
+"""
+import json
+import sys
+import time
+
+from .error import ErrorCode
+from .output import Output
+
+
+class Profiler:
+    # number of rows in printed tables
+    TOP = 10
+
+    def __init__(self, lof_ins: list):
+        self._lof_ins = lof_ins
+        self._counts = [0] * len(lof_ins)
+        self._times = [0.0] * len(lof_ins)
+        self._start = None
+
+
+    def wrap(self, code: list) -> list:
+        """Return program whose instructions record their executions
+
+        Instructions are looked up in the original list on every execution,
+        so instructions which replace themselves (lazy mode) are profiled
+        too.
+
+        Parameters:
+        code (list): Pre-bound instructions indexed by program counter value
+
+        Returns:
+        list: Profiled instructions indexed by program counter value
+        """
+        counts = self._counts
+        times = self._times
+        clock = time.perf_counter
+
+        def profiled(prg_cntr: int):
+            def run():
+                start = clock()
+                try:
+                    return code[prg_cntr]()
+                finally:
+                    times[prg_cntr] += clock() - start
+                    counts[prg_cntr] += 1
+            return run
+
+        self._start = clock()
+        return [profiled(prg_cntr) for prg_cntr in range(len(code))]
+
+
+    def results(self) -> dict:
+        """Return collected statistics
+
+        Returns:
+        dict: Total time, statistics of opcodes (by name) and statistics
+            of executed instructions (by order)
+        """
+        total = time.perf_counter() - self._start if self._start else 0.0
+        opcodes = {}
+        instructions = []
+        for stat, count, spent in zip(self._lof_ins, self._counts, self._times):
+            if count == 0:
+                continue
+            opcode = opcodes.setdefault(stat.ins, {'count': 0, 'time': 0.0})
+            opcode['count'] += count
+            opcode['time'] += spent
+            instructions.append({'order': stat.order, 'opcode': stat.ins,
+                                 'count': count, 'time': spent,
+                                 'mean': spent / count})
+        for opcode in opcodes.values():
+            opcode['mean'] = opcode['time'] / opcode['count']
+
+        return {'total_time': total,
+                'instructions_executed': sum(self._counts),
+                'opcodes': opcodes,
+                'instructions': instructions}
+
+
+    def write(self, path: str):
+        """Write statistics to JSON file and print tables to stderr
+
+        Parameters:
+        path (str): Path to the JSON file
+
+        """
+        results = self.results()
+        try:
+            with open(path, 'w') as _f:
+                json.dump(results, _f, indent=1)
+        except OSError:
+            ErrorCode.exit_error(f"Cannot write profile {path}",
+                                 ErrorCode.UNDEFINED_ERROR)
+
+        opcodes = sorted(results['opcodes'].items(),
+                         key=lambda item: item[1]['time'], reverse=True)
+        instructions = sorted(results['instructions'],
+                              key=lambda item: item['time'], reverse=True)
+
+        lines = [f"Profile: {results['instructions_executed']} instructions "
+                 f"in {results['total_time']:.3f} s",
+                 f"{'opcode':<12}{'count':>12}{'time [s]':>12}{'mean [us]':>12}"]
+        for name, opcode in opcodes[:self.TOP]:
+            lines.append(f"{name:<12}{opcode['count']:>12}{opcode['time']:>12.6f}"
+                         f"{opcode['mean'] * 1e6:>12.2f}")
+        lines.append(f"{'order':>6} {'opcode':<12}{'count':>12}"
+                     f"{'time [s]':>12}{'mean [us]':>12}")
+        for ins in instructions[:self.TOP]:
+            lines.append(f"{ins['order']:>6} {ins['opcode']:<12}{ins['count']:>12}"
+                         f"{ins['time']:>12.6f}{ins['mean'] * 1e6:>12.2f}")
+
+        Output.flush_for_stderr()
+        sys.stderr.write('\n'.join(lines) + '\n')
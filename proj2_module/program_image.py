@@ -0,0 +1,293 @@
+"""Compiled program images
+
+Program image stores validated, sorted and label-linked program together
+with proven operand types, so running it again skips XML loading and
+all load-time checks. Image consists of a header (magic bytes, image
+format version and Python marshal version) followed by marshalled program.
+
+Images are either stored explicitly (--compile-only) or kept in a cache
+directory under a hash of the XML source (--image-cache). Long-running
+server (--serve) keeps images of recently executed sources in memory.
+
+Author: Hung Do
+File:   program_image.py
+Module: proj2_module
+"""
+import hashlib
+import importlib.util
+import io
+import marshal
+import os
+import sys
+
+from .coredata import CoreData
+from .error import ErrorCode
+from .statement import Statement, Argument
+from .xml_parser import xml_parser, format_validation
+from .instruction_set import instruct_set
+from .verifier import verify_program, verify_statement
+from .type_inference import infer_types
+
+IMAGE_MAGIC = b'IPPC'
+# increase when content of the image changes
+IMAGE_VERSION = b'\x00\x01'
+IMAGE_HEADER = IMAGE_MAGIC + IMAGE_VERSION + importlib.util.MAGIC_NUMBER
+# number of images in memory cache, the oldest one is dropped
+MEMORY_CACHE_SIZE = 128
+
+
+def parse_program(lazy: bool=False) -> list:
+    """Load program from XML source and prepare it for execution
+
+    Parameters:
+    lazy (bool): Leave arguments undecoded and skip type inference
+
+    Returns:
+    list: Sorted list of checked instructions (Statement)
+    """
+    lof_ins = xml_parser(lazy)
+    verify_program(lof_ins)
+    lof_ins.sort(key=(lambda statement: statement.order))
+    CoreData.set_jumps(lof_ins)
+    CoreData.set_frames(lof_ins)
+    if not lazy:
+        infer_types(lof_ins)
+    return lof_ins
+
+
+def is_image(path: str) -> bool:
+    """Check if file is a program image
+
+    Parameters:
+    path (str): Path to the file; None for stdin
+
+    Returns:
+    bool: True if file starts with image magic bytes; False if it cannot
+        be read (error is reported by XML loading)
+    """
+    if path is None:
+        return False
+    try:
+        with open(path, 'rb') as _f:
+            return _f.read(len(IMAGE_MAGIC)) == IMAGE_MAGIC
+    except OSError:
+        return False
+
+
+def make_image(lof_ins: list) -> tuple:
+    """Return image of loaded program
+
+    Parameters:
+    lof_ins (list): Sorted list of checked instructions (Statement)
+
+    Returns:
+    dict, tuple: Label destinations and instructions as plain values
+    """
+    program = tuple(
+            (stat.ins, stat.order,
+             tuple((arg.type, arg.value) for arg in stat.args),
+             stat.types)
+            for stat in lof_ins)
+    return CoreData.labels, program
+
+
+def _damaged_program(labels: dict, lof_ins: list) -> bool:
+    """Check instructions of the image the same way as loaded XML
+
+    Parameters:
+    labels (dict):  Label destinations
+    lof_ins (list): Instructions built from the image
+
+    Returns:
+    bool: True if any instruction or label is invalid otherwise False
+    """
+    nof_ins = len(lof_ins)
+    for dest in labels.values():
+        if dest.__class__ is not int or not 0 < dest <= nof_ins:
+            return True
+    for stat in lof_ins:
+        if instruct_set.get(stat.ins) is None or verify_statement(stat):
+            return True
+        if stat.types is not None and len(stat.types) != len(stat.args):
+            return True
+        for arg in stat.args:
+            if arg.type == 'label' and arg.value not in labels:
+                return True
+            if arg.type == 'var' and (arg.value.__class__ is not str
+                                      or format_validation('var', arg.value)):
+                return True
+    return False
+
+
+def program_from_image(labels: dict, program: tuple) -> list:
+    """Build instructions of the program image
+
+    Parameters:
+    labels (dict):      Label destinations
+    program (tuple):    Instructions as plain values
+
+    Returns:
+    list: Sorted list of instructions (Statement); None if the values
+        are not a valid program (image is damaged)
+    """
+    lof_ins = []
+    try:
+        for ins, order, args, types in program:
+            stat = Statement(ins, order, ())
+            stat.args = [Argument.from_value(arg_type, value)
+                         for arg_type, value in args]
+            stat.types = types
+            lof_ins.append(stat)
+        labels = dict(labels)
+        if _damaged_program(labels, lof_ins):
+            return None
+    except (ValueError, TypeError):
+        return None
+    CoreData.labels = labels
+    CoreData.set_frames(lof_ins)
+    return lof_ins
+
+
+def write_image(path: str, lof_ins: list):
+    """Store loaded program to the image file
+
+    File is replaced atomically, so concurrent runs never read
+    partially written image.
+
+    Parameters:
+    path (str):     Path to the image file
+    lof_ins (list): Sorted list of checked instructions (Statement)
+
+    """
+    data = IMAGE_HEADER + marshal.dumps(make_image(lof_ins))
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as _f:
+            _f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        ErrorCode.exit_error(f"Cannot write program image {path}",
+                             ErrorCode.UNDEFINED_ERROR)
+
+
+def read_image(path: str) -> list:
+    """Load program from the image file
+
+    Parameters:
+    path (str): Path to the image file
+
+    Returns:
+    list: Sorted list of instructions (Statement); None if file is not
+        an image of current version
+    """
+    try:
+        with open(path, 'rb') as _f:
+            data = _f.read()
+    except OSError:
+        return None
+    if not data.startswith(IMAGE_HEADER):
+        return None
+    try:
+        labels, program = marshal.loads(data[len(IMAGE_HEADER):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return program_from_image(labels, program)
+
+
+def cached_image_path(source_file: str, cache_dir: str) -> str:
+    """Return path of cached image of the XML source
+
+    Parameters:
+    source_file (str):  Path to the XML source
+    cache_dir (str):    Cache directory
+
+    Returns:
+    str: Path to the image named by hash of source content
+    """
+    digest = hashlib.sha256()
+    with open(source_file, 'rb') as _f:
+        for chunk in iter(lambda: _f.read(1 << 16), b''):
+            digest.update(chunk)
+    return os.path.join(cache_dir, f"{digest.hexdigest()[:32]}.ippc")
+
+
+def load_cached_program(cache: dict) -> list:
+    """Load program from the memory cache or XML source
+
+    Source is read as a whole and its image is looked up by hash of its
+    content, so changed file is never served from the cache.
+
+    Parameters:
+    cache (dict): Program images by hash of the source
+
+    Returns:
+    list: Sorted list of instructions (Statement) ready for execution
+    """
+    if CoreData.source_file is not None:
+        try:
+            with open(CoreData.source_file, 'rb') as _f:
+                source = _f.read()
+        except OSError:
+            # error of unreadable source is reported by XML loading
+            return parse_program()
+    else:
+        source = (CoreData.source_stream or sys.stdin.buffer).read()
+
+    key = hashlib.sha256(source).digest()
+    image = cache.get(key)
+    if image is not None:
+        return program_from_image(*image)
+
+    CoreData.source_file = None
+    CoreData.source_stream = io.BytesIO(source)
+    lof_ins = parse_program()
+    if len(cache) >= MEMORY_CACHE_SIZE:
+        del cache[next(iter(cache))]
+    labels, program = make_image(lof_ins)
+    cache[key] = (dict(labels), program)
+    return lof_ins
+
+
+def load_program() -> list:
+    """Load program from image or XML source
+
+    Source file may be a program image. With cache directory set, images
+    of XML sources are looked up by hash of the source and created
+    on a cache miss. The same is done in memory with program cache
+    of the server.
+
+    Returns:
+    list: Sorted list of instructions (Statement) ready for execution
+    """
+    source_file = CoreData.source_file
+    if is_image(source_file):
+        lof_ins = read_image(source_file)
+        if lof_ins is None:
+            ErrorCode.exit_error(
+                    f"Program image {source_file} is damaged or was "
+                    "created by different version of interpreter",
+                    ErrorCode.XML_FORMAT_ERROR)
+        return lof_ins
+
+    if CoreData.program_cache is not None and not CoreData.lazy_decode:
+        return load_cached_program(CoreData.program_cache)
+    if CoreData.image_cache is None or source_file is None:
+        return parse_program(CoreData.lazy_decode)
+
+    try:
+        image_path = cached_image_path(source_file, CoreData.image_cache)
+    except OSError:
+        # error of unreadable source is reported by XML loading
+        return parse_program()
+    lof_ins = read_image(image_path)
+    if lof_ins is None:
+        lof_ins = parse_program()
+        try:
+            os.makedirs(CoreData.image_cache, exist_ok=True)
+        except OSError:
+            ErrorCode.exit_error(
+                    f"Cannot create cache directory {CoreData.image_cache}",
+                    ErrorCode.UNDEFINED_ERROR)
+        write_image(image_path, lof_ins)
+    return lof_ins
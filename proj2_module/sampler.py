@@ -0,0 +1,144 @@
+"""Sampling profiler of interpreted programs
+
+Real-time timer signal (SIGALRM) periodically interrupts the program
+(process CPU timers are too coarse, they fire only with kernel ticks).
+Signal handler reads program counter from the frame of the main loop and
+the call stack of the program (CoreData.stack_func), so nothing is added
+to executed instructions and overhead depends only on the sampling interval.
+
+Samples are written in collapsed-stack format of flamegraph tools, every
+line contains labels of called functions from the outermost one, executed
+instruction and the number of its samples. Inclusive and exclusive time
+of every function is printed to stderr.
+
+Author: Hung Do
+File:   sampler.py
+Module: proj2_module
+"""
+import signal
+import sys
+
+from .coredata import CoreData
+from .error import ErrorCode
+from .output import Output
+
+# name of code outside of any called function
+MAIN_NAME = '(main)'
+
+
+class SamplingProfiler:
+    # number of rows in printed table
+    TOP = 10
+    DEFAULT_INTERVAL = 0.001
+
+    def __init__(self, lof_ins: list, interval: float=DEFAULT_INTERVAL):
+        """
+        Parameters:
+        lof_ins (list):     Sorted list of instructions (Statement)
+        interval (float):   Sampling interval in seconds
+
+        """
+        self._lof_ins = lof_ins
+        self._interval = interval
+        self._samples = {}
+        self._loop_frame = None
+        self._old_handler = None
+
+
+    @staticmethod
+    def available() -> bool:
+        """Check if platform supports timer signals"""
+        return hasattr(signal, 'setitimer') and hasattr(signal, 'SIGALRM')
+
+
+    def _sample(self, signum, frame):
+        """Record program counter and call stack of executed instruction"""
+        prg_cntr = self._loop_frame.f_locals.get('ins_index')
+        if prg_cntr is None or prg_cntr >= len(self._lof_ins):
+            return
+        key = (tuple(CoreData.stack_func), prg_cntr)
+        self._samples[key] = self._samples.get(key, 0) + 1
+
+
+    def start(self, loop_frame):
+        """Start sampling
+
+        Parameters:
+        loop_frame (frame): Frame of the function running the main loop,
+                            its local variable ins_index is program counter
+
+        """
+        self._loop_frame = loop_frame
+        self._old_handler = signal.signal(signal.SIGALRM, self._sample)
+        signal.setitimer(signal.ITIMER_REAL, self._interval, self._interval)
+
+
+    def stop(self):
+        """Stop sampling"""
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._old_handler)
+        self._loop_frame = None
+
+
+    def _function_name(self, call_cntr: int) -> str:
+        """Return label called by CALL instruction"""
+        stat = self._lof_ins[call_cntr]
+        if stat.args and stat.args[0].type == 'label':
+            return stat.args[0].value
+        return f"{stat.ins}@{stat.order}"
+
+
+    def stacks(self) -> dict:
+        """Return collected samples
+
+        Returns:
+        dict: Number of samples by tuple of names of functions (from the
+            outermost one) ending with executed instruction
+        """
+        stacks = {}
+        for (calls, prg_cntr), count in self._samples.items():
+            stat = self._lof_ins[prg_cntr]
+            stack = ((MAIN_NAME,)
+                     + tuple(self._function_name(call) for call in calls)
+                     + (f"{stat.ins}@{stat.order}",))
+            stacks[stack] = stacks.get(stack, 0) + count
+        return stacks
+
+
+    def write(self, path: str):
+        """Write collapsed stacks to the file and print function times
+
+        Parameters:
+        path (str): Path to the collapsed-stack file
+
+        """
+        stacks = self.stacks()
+        try:
+            with open(path, 'w') as _f:
+                for stack, count in sorted(stacks.items()):
+                    _f.write(f"{';'.join(stack)} {count}\n")
+        except OSError:
+            ErrorCode.exit_error(f"Cannot write samples {path}",
+                                 ErrorCode.UNDEFINED_ERROR)
+
+        total = sum(stacks.values())
+        inclusive = {}
+        exclusive = {}
+        for stack, count in stacks.items():
+            functions = stack[:-1]
+            # recursive function is counted once in every sample
+            for name in set(functions):
+                inclusive[name] = inclusive.get(name, 0) + count
+            exclusive[functions[-1]] = exclusive.get(functions[-1], 0) + count
+
+        lines = [f"Samples: {total} every {self._interval * 1000:g} ms",
+                 f"{'function':<20}{'inclusive':>12}{'%':>8}"
+                 f"{'exclusive':>12}{'%':>8}"]
+        for name, count in sorted(inclusive.items(), key=lambda item: item[1],
+                                  reverse=True)[:self.TOP]:
+            own = exclusive.get(name, 0)
+            lines.append(f"{name:<20}{count:>12}{100 * count / total:>8.1f}"
+                         f"{own:>12}{100 * own / total:>8.1f}")
+
+        Output.flush_for_stderr()
+        sys.stderr.write('\n'.join(lines) + '\n')
@@ -0,0 +1,163 @@
+"""Interpreter server on a Unix domain socket
+
+Server (--serve) is started once and executes programs sent by clients
+(interpret_client.py), so Python startup, argument processing and imports
+are paid only once. Loaded programs are kept in memory under a hash of
+their source, so the same program is not parsed and checked again.
+Requests are handled one by one by Interpreter.run.
+
+Every message is a sequence of frames, frame is its length (4 bytes,
+big-endian) followed by its data:
+- request:  JSON header {"source": path|null, "input": path|null},
+            XML source (used when source path is null),
+            input of the program (used when input path is null)
+- response: JSON header {"exit_code": int}, stdout, stderr (UTF-8)
+
+Author: Hung Do
+File:   server.py
+Module: proj2_module
+"""
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import traceback
+
+from .error import ErrorCode
+from .interpreter import Interpreter
+
+FRAME_HEADER = struct.Struct('!I')
+
+
+def send_frames(sock: socket.socket, frames: list):
+    """Send frames of one message
+
+    Parameters:
+    sock (socket):  Connected socket
+    frames (list):  Data (bytes) of frames
+
+    """
+    sock.sendall(b''.join(FRAME_HEADER.pack(len(frame)) + frame
+                          for frame in frames))
+
+
+def receive_frames(stream, count: int) -> list:
+    """Receive frames of one message
+
+    Parameters:
+    stream (file):  Binary stream of the connection
+    count (int):    Number of frames in the message
+
+    Returns:
+    list: Data (bytes) of frames
+    """
+    frames = []
+    for _ in range(count):
+        header = stream.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            raise EOFError('Connection closed in the middle of message')
+        size, = FRAME_HEADER.unpack(header)
+        frame = stream.read(size)
+        if len(frame) < size:
+            raise EOFError('Connection closed in the middle of message')
+        frames.append(frame)
+    return frames
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Executes program of one request"""
+
+    def handle(self):
+        try:
+            header, source, input_data = receive_frames(self.rfile, 3)
+            request = json.loads(header)
+        except (EOFError, ValueError) as error:
+            sys.stderr.write(f"Invalid request: {error}\n")
+            return
+
+        program = request.get('source')
+        if program is None:
+            program = source
+        stdin = request.get('input')
+        if stdin is None:
+            stdin = io.BytesIO(input_data)
+
+        stdout = io.BytesIO()
+        stderr = io.StringIO()
+        try:
+            exit_code = self.server.interpreter.run(program, stdin, stdout, stderr)
+        except Exception:
+            stderr.write(traceback.format_exc())
+            exit_code = ErrorCode.UNDEFINED_ERROR
+
+        try:
+            send_frames(self.request,
+                        [json.dumps({'exit_code': exit_code}).encode(),
+                         stdout.getvalue(),
+                         stderr.getvalue().encode('utf-8', 'replace')])
+        except OSError:
+            # client doesn't wait for the result any more
+            pass
+
+
+class _Server(socketserver.UnixStreamServer):
+
+    def __init__(self, path: str, interpreter: Interpreter):
+        super().__init__(path, _RequestHandler)
+        self.interpreter = interpreter
+
+
+def _remove_stale_socket(path: str):
+    """Remove socket left by server which didn't exit cleanly"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        ErrorCode.exit_error(f"File {path} exists and it is not a socket",
+                             ErrorCode.UNDEFINED_ERROR)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            os.unlink(path)
+            return
+    ErrorCode.exit_error(f"Server is already running on {path}",
+                         ErrorCode.UNDEFINED_ERROR)
+
+
+def serve(path: str, interpreter: Interpreter) -> int:
+    """Execute programs sent to the socket until the server is interrupted
+
+    Parameters:
+    path (str):                 Path to the Unix domain socket
+    interpreter (Interpreter):  Interpreter executing the programs
+
+    Returns:
+    int: Exit code of the server
+    """
+    _remove_stale_socket(path)
+    try:
+        server = _Server(path, interpreter)
+    except OSError as error:
+        ErrorCode.exit_error(f"Cannot listen on {path}: {error.strerror}",
+                             ErrorCode.UNDEFINED_ERROR)
+
+    # SIGTERM stops the server the same way as Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return 0
@@ -1,11 +1,18 @@
 """Instruction set of stack operations
 
 All functions in this file take two parameters:
-    prg_cntr (int): Value of current instruction pointer (program counter)
-    args (list):     List of arguments of given command/statement
+    prg_cntr (int): Index of the instruction in sorted list of instructions
+    args (list):     List of arguments of given command/statement, checked
+                     against instruction's signature (see verifier.py)
 
 All functions return:
-    int: Updated program counter
+    function: Pre-bound instruction without parameters. Operands are resolved
+        when the instruction is built, calling it executes the instruction and
+        returns updated program counter.
+
+Data stack keeps raw values in CoreData.stack_vals and their data types
+in CoreData.stack_types, so no wrapper object is allocated for the values.
+Binary operations replace the value on the top of the stack in place.
 
 Author: Hung Do
 File:   stack_instruction_set.py
@@ -13,300 +20,287 @@ Module: proj2_module
 """
 from .error import ErrorCode
 from .coredata import CoreData
-from .statement import Argument
 from .frame import Variable
 
 UNICODE_MAX_VAL: int = 1_114_111
+NUMBERS = ('int', 'float')
+
+
+def _empty_stack():
+    ErrorCode.exit_error("Stack is empty", ErrorCode.RUNTIME_MISSING_VALUE)
+
+
+def _wrong_type(prg_cntr: int):
+    ErrorCode.exit_error(
+            f"Wrong symbol's data type while executing {prg_cntr+1}. command",
+            ErrorCode.RUNTIME_WRONG_TYPE)
+
+
+def _string_handling(prg_cntr: int):
+    ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                         ErrorCode.RUNTIME_STRING_HANDLING)
+
+
+def _zero_division():
+    ErrorCode.exit_error("Cannot divide by zero!", ErrorCode.RUNTIME_WRONG_VALUE)
 
 
 def pushs(prg_cntr: int, args: list):
     """ Push value of <symb> to stack
         PUSHS <symb>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    if args[0].type == 'var':
-        var = CoreData.get_variable(args[0].value)
-        if var.type == 'UNDEF':
+    get_symb = CoreData.symbol_getter(args[0])
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        symb = get_symb()
+        if symb.type == 'UNDEF':
             ErrorCode.exit_error(
                     f"Missing value while executing {prg_cntr+1}. command",
                     ErrorCode.RUNTIME_MISSING_VALUE)
-        value = var.value
-    else:
-        value = args[0].value
 
-    CoreData.stack_push(value)
-    return prg_cntr + 1
+        stack_vals.append(symb.value)
+        stack_types.append(symb.type)
+        return next_ins
+    return run
 
 
 def pops(prg_cntr: int, args: list):
     """ Pop data from stack to <var>
         POPS <var>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    get_var = CoreData.var_getter(args[0])
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    var: Variable = CoreData.get_variable(args[0].value)
+    def run():
+        var: Variable = get_var()
+        if not stack_vals:
+            _empty_stack()
 
-    stack_value = CoreData.stack_pop()
-    var.value = stack_value.value
-    return prg_cntr + 1
+        var._value = stack_vals.pop()
+        var._type = stack_types.pop()
+        return next_ins
+    return run
 
 
 def clears(prg_cntr: int, args: list):
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-    CoreData.stack_vals.clear()
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        stack_vals.clear()
+        stack_types.clear()
+        return next_ins
+    return run
 
 
 def adds(prg_cntr: int, args: list):
     """ Add two numbers and store in <var>
         ADDS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    CoreData.stack_push(op1.value + op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type not in NUMBERS or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] + op2
+        return next_ins
+    return run
 
 
 def subs(prg_cntr: int, args: list):
     """ Subtract two numbers and store in <var>
         SUBS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    CoreData.stack_push(op1.value - op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type not in NUMBERS or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] - op2
+        return next_ins
+    return run
 
 
 def muls(prg_cntr: int, args: list):
     """ Multiply two numbers and store in <var>
         MULS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    CoreData.stack_push(op1.value * op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type not in NUMBERS or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] * op2
+        return next_ins
+    return run
 
 
 def divs(prg_cntr: int, args: list):
     """ Divide two numbers and store in <var>
         DIVS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # div zero check
-    if op2.value == 0:
-        ErrorCode.exit_error(
-                "Cannot divide by zero!",
-                ErrorCode.RUNTIME_WRONG_VALUE)
-
-    CoreData.stack_push(op1.value / op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type not in NUMBERS or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        # div zero check
+        if op2 == 0:
+            _zero_division()
+
+        stack_vals[-1] = stack_vals[-1] / op2
+        stack_types[-1] = 'float'
+        return next_ins
+    return run
 
 
 def idivs(prg_cntr: int, args: list):
     """ Divide two numbers and store in <var> round down value
         IDIVS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if (op1.type not in ('int', 'float') or op2.type not in ('int', 'float')
-        or op1.type != op2.type):
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # div zero check
-    if op2.value == 0:
-        ErrorCode.exit_error(
-                "Cannot divide by zero!",
-                ErrorCode.RUNTIME_WRONG_VALUE)
-
-    CoreData.stack_push(op1.value // op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type not in NUMBERS or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        # div zero check
+        if op2 == 0:
+            _zero_division()
+
+        stack_vals[-1] = stack_vals[-1] // op2
+        return next_ins
+    return run
 
 
 def lts(prg_cntr: int, args: list):
     """ Check if <symb1> is less than <symb2>; store in <var>
         LTS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type == 'nil' or op2.type == 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-    if op1.type != op2.type:
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    CoreData.stack_push(op1.value < op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type == 'nil' or op2_type == 'nil' or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] < op2
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def gts(prg_cntr: int, args: list):
     """ Check if <symb1> is greater than <symb2>; store in <var>
         GTS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type == 'nil' or op2.type == 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-    if op1.type != op2.type:
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # value = op1.value < op2.value
-    CoreData.stack_push(op1.value > op2.value)
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type == 'nil' or op2_type == 'nil' or op1_type != op2_type:
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] > op2
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def eqs(prg_cntr: int, args: list):
     """ Check if <symb1> and <symb2> values are equal; store in <var>
         EQS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1_type != op2_type and op1_type != 'nil' and op2_type != 'nil':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(op1.value == op2.value)
-    return prg_cntr + 1
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] == op2
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def ands(prg_cntr: int, args: list):
@@ -314,27 +308,25 @@ def ands(prg_cntr: int, args: list):
             otherwise store 'false'
         ANDS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool' or op2.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1_type != 'bool' or op2_type != 'bool':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(op1.value and op2.value)
-    return prg_cntr + 1
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] and op2
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def ors(prg_cntr: int, args: list):
@@ -342,84 +334,73 @@ def ors(prg_cntr: int, args: list):
             otherwise store 'true'
         ORS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool' or op2.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1_type != 'bool' or op2_type != 'bool':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(op1.value or op2.value)
-    return prg_cntr + 1
+        op2 = stack_vals.pop()
+        stack_vals[-1] = stack_vals[-1] or op2
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def nots(prg_cntr: int, args: list):
     """ Negate <symb> value and store in <var>
         NOTS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op1 = CoreData.stack_pop()
+    def run():
+        if not stack_vals:
+            _empty_stack()
 
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'bool':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if stack_types[-1] != 'bool':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(not op1.value)
-    return prg_cntr + 1
+        stack_vals[-1] = not stack_vals[-1]
+        stack_types[-1] = 'bool'
+        return next_ins
+    return run
 
 
 def int2chars(prg_cntr: int, args: list):
     """ Convert number <symb> to ascii value character
         INT2CHARS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op1 = CoreData.stack_pop()
+    def run():
+        if not stack_vals:
+            _empty_stack()
 
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if stack_types[-1] != 'int':
+            _wrong_type(prg_cntr)
 
-    # ord function range check
-    if op1.value not in range(UNICODE_MAX_VAL + 1):
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_STRING_HANDLING)
+        # ord function range check
+        if stack_vals[-1] not in range(UNICODE_MAX_VAL + 1):
+            _string_handling(prg_cntr)
 
-    CoreData.stack_push(chr(op1.value))
-    return prg_cntr + 1
+        stack_vals[-1] = chr(stack_vals[-1])
+        stack_types[-1] = 'string'
+        return next_ins
+    return run
 
 
 def stri2ints(prg_cntr: int, args: list):
@@ -427,137 +408,118 @@ def stri2ints(prg_cntr: int, args: list):
             in <var>
         STRI2INTS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'string' or op2.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    # index range check
-    if op2.value not in range(len(op1.value)):
-        ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
-                             ErrorCode.RUNTIME_STRING_HANDLING)
-
-    CoreData.stack_push(ord(op1.value[op2.value]))
-    return prg_cntr + 1
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types[-1]
+
+        # runtime type check
+        if op1_type != 'string' or op2_type != 'int':
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        # index range check
+        if op2 not in range(len(stack_vals[-1])):
+            _string_handling(prg_cntr)
+
+        stack_vals[-1] = ord(stack_vals[-1][op2])
+        stack_types[-1] = 'int'
+        return next_ins
+    return run
 
 
 def int2floats(prg_cntr: int, args: list):
     """ Converts int value <symb> to float and store in <var>
         INT2FLOATS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op1 = CoreData.stack_pop()
+    def run():
+        if not stack_vals:
+            _empty_stack()
 
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'int':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if stack_types[-1] != 'int':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(float(op1.value))
-    return prg_cntr + 1
+        stack_vals[-1] = float(stack_vals[-1])
+        stack_types[-1] = 'float'
+        return next_ins
+    return run
 
 
 def float2ints(prg_cntr: int, args: list):
     """ Converts float value <symb> to int and store in <var>
         FLOAT2INTS
     """
-    if len(args) != 0:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    op1 = CoreData.stack_pop()
+    def run():
+        if not stack_vals:
+            _empty_stack()
 
-    # initialization check
-    if op1.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-    # runtime type check
-    if op1.type != 'float':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if stack_types[-1] != 'float':
+            _wrong_type(prg_cntr)
 
-    CoreData.stack_push(int(op1.value))
-    return prg_cntr + 1
+        stack_vals[-1] = int(stack_vals[-1])
+        stack_types[-1] = 'int'
+        return next_ins
+    return run
 
 
 def jumpifeqs(prg_cntr: int, args: list):
     """ Jump to <label> if <symb1> is equal to <symb2>
         JUMPIFEQS <label>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    lbl_name = args[0].value
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
+    target = CoreData.labels[args[0].value]
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
 
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types.pop()
 
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
+        # runtime type check
+        if op1_type != op2_type and op1_type != 'nil' and op2_type != 'nil':
+            _wrong_type(prg_cntr)
 
-    return CoreData.labels[lbl_name] if op1.value == op2.value else prg_cntr + 1
+        op2 = stack_vals.pop()
+        return target if stack_vals.pop() == op2 else next_ins
+    return run
 
 
 def jumpifneqs(prg_cntr: int, args: list):
     """ Jump to <label> if <symb1> is not equal to <symb2>
         JUMPIFNEQS <label>
     """
-    if len(args) != 1:
-        ErrorCode.exit_error(
-                f"""Wrong number of arguments while executing {prg_cntr+1}. command""",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    lbl_name = args[0].value
-    op2 = CoreData.stack_pop()
-    op1 = CoreData.stack_pop()
-
-    # initialization check
-    if op1.type == 'UNDEF' or op2.type == 'UNDEF':
-        ErrorCode.exit_error(
-                f"Missing value while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_MISSING_VALUE)
-
-    # runtime type check
-    if op1.type != op2.type and op1.type != 'nil' and op2.type != 'nil':
-        ErrorCode.exit_error(
-               f"Wrong symbol's data type while executing {prg_cntr+1}. command",
-                ErrorCode.RUNTIME_WRONG_TYPE)
-
-    return CoreData.labels[lbl_name] if op1.value != op2.value else prg_cntr + 1
+    target = CoreData.labels[args[0].value]
+    stack_vals = CoreData.stack_vals
+    stack_types = CoreData.stack_types
+    next_ins = prg_cntr + 1
+
+    def run():
+        if len(stack_vals) < 2:
+            _empty_stack()
+        op2_type = stack_types.pop()
+        op1_type = stack_types.pop()
+
+        # runtime type check
+        if op1_type != op2_type and op1_type != 'nil' and op2_type != 'nil':
+            _wrong_type(prg_cntr)
+
+        op2 = stack_vals.pop()
+        return target if stack_vals.pop() != op2 else next_ins
+    return run
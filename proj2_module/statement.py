@@ -7,6 +7,7 @@ Module: proj2_module
 import re
 
 class Argument:
+    __slots__ = ('_type', '_value')
 
     def __init__(self, arg: tuple=None):
         self._type = 'UNDEF'
@@ -15,6 +16,23 @@ class Argument:
             self._symbol_init(arg)
 
 
+    @classmethod
+    def from_value(cls, arg_type: str, value):
+        """Create argument holding given value as it is
+
+        Parameters:
+        arg_type (str): Argument's data type
+        value (Object): Value of the argument
+
+        Returns:
+        Argument: New argument
+        """
+        argument = cls()
+        argument._type = arg_type
+        argument._value = value
+        return argument
+
+
     @property
     def type(self):
         return self._type
@@ -70,11 +88,19 @@ class Argument:
 
 
 class Statement:
+    __slots__ = ('ins', 'order', 'args', 'decoded', 'types')
 
-    def __init__(self, ins, order: int, args: list):
+    def __init__(self, ins, order: int, args: list, decode: bool=True):
         self.ins   = ins
         self.order = order
-        self.args  = [Argument(arg) for arg in args]
+        if decode:
+            self.args = [Argument(arg) for arg in args]
+        else:
+            # arguments keep text from XML until xml_parser.decode_statement
+            self.args = [Argument.from_value(*arg) for arg in args]
+        self.decoded = decode
+        # proven data types of arguments (see type_inference.py)
+        self.types = None
 
 
     def __str__(self):
@@ -0,0 +1,127 @@
+"""Runtime statistics of interpreted program (STATI extension)
+
+Statistics are collected only when they are requested:
+- insts:    number of executed instructions (without LABEL, DPRINT and BREAK)
+- hot:      order of the most executed instruction (the lowest order wins)
+- vars:     maximal number of initialized variables in all valid frames
+- frequent: the most frequent opcodes in the source code
+
+Executions are counted by the main loop for every program counter value.
+Number of initialized variables may drop only when CREATEFRAME or POPFRAME
+discards temporary frame, so it is measured just before these instructions
+and at the end of the program.
+
+Author: Hung Do
+File:   stats.py
+Module: proj2_module
+"""
+from .coredata import CoreData
+from .error import ErrorCode
+
+# instructions which are not counted as executed
+NOT_COUNTED = ('LABEL', 'DPRINT', 'BREAK')
+
+
+class Statistics:
+
+    def __init__(self, lof_ins: list, groups: list):
+        """
+        Parameters:
+        lof_ins (list): Sorted list of instructions (Statement)
+        groups (list):  Pairs of output file and list of statistics
+                        in order of their options
+
+        """
+        self._lof_ins = lof_ins
+        self._groups = groups
+        self.counts = [0] * len(lof_ins)
+        # functions called before instruction at the program counter value
+        self.hooks = [None] * len(lof_ins)
+
+        self.max_vars = 0
+        # initialized variables in all frames below each frame of the stack;
+        # only the top of the stack (local frame) can change
+        self._below = []
+        self._track_vars = any('vars' in items for _, items in groups)
+        if self._track_vars:
+            hooks = {'CREATEFRAME': self._before_createframe,
+                     'PUSHFRAME': self._before_pushframe,
+                     'POPFRAME': self._before_popframe}
+            for prg_cntr, stat in enumerate(lof_ins):
+                self.hooks[prg_cntr] = hooks.get(stat.ins)
+
+
+    def _update_vars(self):
+        """Update maximum by initialized variables in all valid frames"""
+        count = CoreData.global_frame.count_initialized()
+        if CoreData.stack_frames:
+            count += self._below[-1] + CoreData.stack_frames[-1].count_initialized()
+        temp_frame = CoreData.temp_frame
+        if temp_frame is not None and temp_frame.is_active:
+            count += temp_frame.count_initialized()
+        if count > self.max_vars:
+            self.max_vars = count
+
+
+    def _before_createframe(self):
+        self._update_vars()
+
+
+    def _before_pushframe(self):
+        temp_frame = CoreData.temp_frame
+        if temp_frame is None or not temp_frame.is_active:
+            # PUSHFRAME fails
+            return
+        if CoreData.stack_frames:
+            self._below.append(self._below[-1]
+                               + CoreData.stack_frames[-1].count_initialized())
+        else:
+            self._below.append(0)
+
+
+    def _before_popframe(self):
+        self._update_vars()
+        if CoreData.stack_frames:
+            self._below.pop()
+
+
+    def results(self) -> dict:
+        """Return values of all statistics
+
+        Returns:
+        dict: Value (str) of every statistic by its name
+        """
+        insts = 0
+        hot = None
+        opcodes = {}
+        for stat, count in zip(self._lof_ins, self.counts):
+            opcodes[stat.ins] = opcodes.get(stat.ins, 0) + 1
+            if stat.ins in NOT_COUNTED:
+                continue
+            insts += count
+            # instructions are sorted by order, the first one wins
+            if count > 0 and (hot is None or count > hot[1]):
+                hot = (stat.order, count)
+
+        most = max(opcodes.values(), default=0)
+        frequent = sorted(opcode for opcode, count in opcodes.items()
+                          if count == most)
+        return {'insts': str(insts),
+                'hot': '' if hot is None else str(hot[0]),
+                'vars': str(self.max_vars),
+                'frequent': ','.join(frequent)}
+
+
+    def write(self):
+        """Write requested statistics to their files, one per line"""
+        if self._track_vars:
+            self._update_vars()
+        results = self.results()
+        for path, items in self._groups:
+            try:
+                with open(path, 'w') as _f:
+                    for item in items:
+                        _f.write(results[item] + '\n')
+            except OSError:
+                ErrorCode.exit_error(f"Cannot write statistics {path}",
+                                     ErrorCode.UNDEFINED_ERROR)
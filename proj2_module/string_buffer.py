@@ -0,0 +1,106 @@
+"""Mutable string value of a variable
+
+SETCHAR and CONCAT that appends to its own target change the value
+of the variable in place. Such variable holds StringBuffer instead of str,
+which keeps the characters in a list, so both operations take amortized
+O(1) time per changed character. Buffer behaves like a string when it is
+compared, indexed or measured; str is built only when the value is
+observed as a whole and it is kept until the next change.
+
+Buffer is never shared by two variables: Variable.value getter and
+instructions copying values between variables use its str value.
+
+Author: Hung Do
+File:   string_buffer.py
+Module: proj2_module
+"""
+
+class StringBuffer:
+    __slots__ = ('_chars', '_text')
+
+    def __init__(self, text: str):
+        self._chars = list(text)
+        self._text = text
+
+
+    @property
+    def text(self) -> str:
+        """Value of the buffer as str"""
+        if self._text is None:
+            self._text = ''.join(self._chars)
+        return self._text
+
+
+    def __len__(self):
+        return len(self._chars)
+
+
+    def __getitem__(self, index):
+        return self._chars[index]
+
+
+    def __eq__(self, other):
+        return self.text == other
+
+
+    def __lt__(self, other):
+        return self.text < other
+
+
+    def __gt__(self, other):
+        return self.text > other
+
+
+    def __add__(self, other):
+        return self.text + other
+
+
+    def __radd__(self, other):
+        return other + self.text
+
+
+    def __hash__(self):
+        return hash(self.text)
+
+
+    def __str__(self):
+        return self.text
+
+
+    def __repr__(self):
+        return repr(self.text)
+
+
+def buffer_append(value, text: str) -> StringBuffer:
+    """Append text to the string value in place
+
+    Parameters:
+    value (str, StringBuffer):  Current value of the variable
+    text (str):                 Appended text
+
+    Returns:
+    StringBuffer: New value of the variable
+    """
+    if value.__class__ is not StringBuffer:
+        value = StringBuffer(value)
+    value._chars.extend(text)
+    value._text = None
+    return value
+
+
+def buffer_setchar(value, index: int, char: str) -> StringBuffer:
+    """Replace character of the string value in place
+
+    Parameters:
+    value (str, StringBuffer):  Current value of the variable
+    index (int):                Position of replaced character
+    char (str):                 New character
+
+    Returns:
+    StringBuffer: New value of the variable
+    """
+    if value.__class__ is not StringBuffer:
+        value = StringBuffer(value)
+    value._chars[index] = char
+    value._text = None
+    return value
@@ -0,0 +1,181 @@
+"""Static type inference over the list of instructions
+
+Dataflow analysis computes for every instruction data types of variables
+that are the same on all paths leading to the instruction. Proven operand
+types are attached to instructions, so instructions with known operand
+types can be built without runtime type checks (see typed_instruction_set.py).
+
+Analysis is intraprocedural and conservative: nothing is known at the start
+of the program, at the beginning of a function and after CALL instruction.
+Frame instructions forget types of variables in affected frames.
+
+Author: Hung Do
+File:   type_inference.py
+Module: proj2_module
+"""
+from .coredata import CoreData
+from .statement import Statement
+
+# types of values stored by instructions to <var>;
+# None - result type is the same as type of <symb1>
+RESULT_TYPES = {
+        'ADD': None,
+        'SUB': None,
+        'MUL': None,
+        'IDIV': None,
+        'DIV': 'float',
+        'LT': 'bool',
+        'GT': 'bool',
+        'EQ': 'bool',
+        'AND': 'bool',
+        'OR': 'bool',
+        'NOT': 'bool',
+        'INT2CHAR': 'string',
+        'STRI2INT': 'int',
+        'INT2FLOAT': 'float',
+        'FLOAT2INT': 'int',
+        'CONCAT': 'string',
+        'STRLEN': 'int',
+        'GETCHAR': 'string',
+        'SETCHAR': 'string',
+        'TYPE': 'string',
+        }
+
+# instructions that store a value of unknown type to <var>
+UNKNOWN_RESULT = ('READ', 'POPS')
+
+FRAME_KILLS = {
+        'CREATEFRAME': ('TF@',),
+        'PUSHFRAME': ('TF@', 'LF@'),
+        'POPFRAME': ('TF@', 'LF@'),
+        }
+
+
+def operand_types(stat: Statement, state: dict) -> tuple:
+    """Return proven types of instruction's operands
+
+    Parameters:
+    stat (Statement): Instruction
+    state (dict):     Known types of variables before the instruction
+
+    Returns:
+    tuple: Data type of each operand; None if type is unknown
+
+    """
+    types = []
+    for arg in stat.args:
+        if arg.type == 'var':
+            types.append(state.get(arg.value) if state is not None else None)
+        elif arg.type in ('label', 'type'):
+            types.append(None)
+        else:
+            types.append(arg.type)
+    return tuple(types)
+
+
+def _transfer(stat: Statement, state: dict) -> dict:
+    """Return known types of variables after the instruction
+
+    Parameters:
+    stat (Statement): Instruction
+    state (dict):     Known types of variables before the instruction
+
+    Returns:
+    dict: Known types of variables after the instruction
+
+    """
+    ins = stat.ins
+    if ins in FRAME_KILLS:
+        prefixes = FRAME_KILLS[ins]
+        return {name: dtype for name, dtype in state.items()
+                if not name.startswith(prefixes)}
+
+    if ins == 'DEFVAR' or ins in UNKNOWN_RESULT:
+        state = dict(state)
+        state.pop(stat.args[0].value, None)
+        return state
+
+    if ins == 'MOVE' or ins in RESULT_TYPES:
+        types = operand_types(stat, state)
+        if ins == 'MOVE' or RESULT_TYPES[ins] is None:
+            # arithmetic operands have the same type when instruction succeeds
+            result = types[1] or (types[2] if len(types) > 2 else None)
+        else:
+            result = RESULT_TYPES[ins]
+
+        state = dict(state)
+        if result is None:
+            state.pop(stat.args[0].value, None)
+        else:
+            state[stat.args[0].value] = result
+    return state
+
+
+def _successors(prg_cntr: int, stat: Statement) -> list:
+    """Return program counter values that can follow the instruction
+
+    Parameters:
+    prg_cntr (int):   Index of the instruction
+    stat (Statement): Instruction
+
+    Returns:
+    list: List of tuples (program counter, bool); bool is True when nothing
+        is known about variables after the transition
+
+    """
+    ins = stat.ins
+    if ins == 'JUMP':
+        return [(CoreData.labels[stat.args[0].value], False)]
+    if ins in ('JUMPIFEQ', 'JUMPIFNEQ', 'JUMPIFEQS', 'JUMPIFNEQS'):
+        return [(CoreData.labels[stat.args[0].value], False),
+                (prg_cntr + 1, False)]
+    if ins == 'CALL':
+        # function may change any variable and frame before it returns
+        return [(CoreData.labels[stat.args[0].value] - 1, True),
+                (prg_cntr + 1, True)]
+    if ins in ('RETURN', 'EXIT'):
+        return []
+    return [(prg_cntr + 1, False)]
+
+
+def _join(old_state: dict, new_state: dict) -> dict:
+    """Keep only types that are the same in both states"""
+    if old_state is None:
+        return dict(new_state)
+    return {name: dtype for name, dtype in old_state.items()
+            if new_state.get(name) == dtype}
+
+
+def infer_types(lof_ins: list):
+    """Attach proven operand types to every instruction
+
+    Requires label map from CoreData.set_jumps. Result is stored in
+    Statement.types; instructions that are never reached have types
+    of constant operands only.
+
+    Parameters:
+    lof_ins (list): Sorted list of instructions (Statement)
+
+    """
+    nof_ins = len(lof_ins)
+    states = [None] * nof_ins
+    worklist = []
+    if nof_ins > 0:
+        states[0] = {}
+        worklist.append(0)
+
+    while worklist:
+        prg_cntr = worklist.pop()
+        stat = lof_ins[prg_cntr]
+        out_state = _transfer(stat, states[prg_cntr])
+
+        for succ, unknown in _successors(prg_cntr, stat):
+            if succ >= nof_ins:
+                continue
+            new_state = _join(states[succ], {} if unknown else out_state)
+            if new_state != states[succ]:
+                states[succ] = new_state
+                worklist.append(succ)
+
+    for stat, state in zip(lof_ins, states):
+        stat.types = operand_types(stat, state)
@@ -0,0 +1,277 @@
+"""Instruction variants for operands with proven data types
+
+All functions in this file take three parameters:
+    prg_cntr (int): Index of the instruction in sorted list of instructions
+    args (list):    List of arguments of given command/statement
+    types (tuple):  Proven data types of arguments (see type_inference.py)
+
+All functions return:
+    function: Pre-bound instruction without runtime type and initialization
+        checks; None if proven types don't allow such variant (instruction
+        is then built from instruction_set.py)
+
+Result type of every variant is known, so the result is stored directly
+to the variable and the type deduction of Variable.value setter is skipped.
+
+Author: Hung Do
+File:   typed_instruction_set.py
+Module: proj2_module
+"""
+import operator
+from .error import ErrorCode
+from .coredata import CoreData
+from .frame import Variable
+from .string_buffer import buffer_append
+
+NUMBERS = ('int', 'float')
+
+
+def _binary(prg_cntr: int, args: list, operation, result_type: str):
+    """Build instruction <var> = operation(<symb1>, <symb2>)
+
+    Parameters:
+    prg_cntr (int):      Index of the instruction
+    args (list):         List of arguments of the instruction
+    operation:           Function of two values computing the result
+    result_type (str):   Data type of the result
+
+    Returns:
+    function: Pre-bound instruction
+
+    """
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    next_ins = prg_cntr + 1
+
+    if args[2].type != 'var':
+        # constant operand is bound directly
+        value2 = args[2].value
+        def run():
+            var: Variable = get_var()
+            var._value = operation(get_op1()._value, value2)
+            var._type = result_type
+            return next_ins
+        return run
+
+    get_op2 = CoreData.symbol_getter(args[2])
+    def run():
+        var: Variable = get_var()
+        var._value = operation(get_op1()._value, get_op2()._value)
+        var._type = result_type
+        return next_ins
+    return run
+
+
+def _arithmetic(operation):
+    """Return builder of arithmetic instruction with given operation"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] not in NUMBERS or types[1] != types[2]:
+            return None
+        return _binary(prg_cntr, args, operation, types[1])
+    return build
+
+
+def _division(operation, result_type: str=None):
+    """Return builder of division instruction with given operation"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] not in NUMBERS or types[1] != types[2]:
+            return None
+        if args[2].type != 'var' and args[2].value != 0:
+            # constant divisor can't be zero
+            return _binary(prg_cntr, args, operation, result_type or types[1])
+
+        get_var = CoreData.var_getter(args[0])
+        get_op1 = CoreData.symbol_getter(args[1])
+        get_op2 = CoreData.symbol_getter(args[2])
+        next_ins = prg_cntr + 1
+        result = result_type or types[1]
+
+        def run():
+            var: Variable = get_var()
+            op1 = get_op1()
+            op2 = get_op2()
+
+            # div zero check
+            if op2._value == 0:
+                ErrorCode.exit_error(f"Cannot divide by zero at {prg_cntr+1}. command",
+                                     ErrorCode.RUNTIME_WRONG_VALUE)
+
+            var._value = operation(op1._value, op2._value)
+            var._type = result
+            return next_ins
+        return run
+    return build
+
+
+def _relation(operation):
+    """Return builder of relational instruction LT/GT"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] in (None, 'nil') or types[1] != types[2]:
+            return None
+        return _binary(prg_cntr, args, operation, 'bool')
+    return build
+
+
+def _logic(operation):
+    """Return builder of logic instruction AND/OR"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] != 'bool' or types[2] != 'bool':
+            return None
+        return _binary(prg_cntr, args, operation, 'bool')
+    return build
+
+
+def _comparable(types: tuple) -> bool:
+    """Check if proven types of <symb1> and <symb2> can be compared for equality"""
+    if types[1] is None or types[2] is None:
+        return False
+    return types[1] == types[2] or types[1] == 'nil' or types[2] == 'nil'
+
+
+def eq(prg_cntr: int, args: list, types: tuple):
+    """ EQ <var> <symb1> <symb2> """
+    if not _comparable(types):
+        return None
+    return _binary(prg_cntr, args, operator.eq, 'bool')
+
+
+def concat(prg_cntr: int, args: list, types: tuple):
+    """ CONCAT <var> <symb1> <symb2> """
+    if types[1] != 'string' or types[2] != 'string':
+        return None
+    if args[1].type != 'var' or args[1].value != args[0].value:
+        return _binary(prg_cntr, args, operator.add, 'string')
+
+    # CONCAT <var> <var> <symb> appends to the variable in place
+    get_var = CoreData.var_getter(args[0])
+    get_op2 = CoreData.symbol_getter(args[2])
+    next_ins = prg_cntr + 1
+
+    def run():
+        text = str(get_op2()._value)
+        var: Variable = get_var()
+        var._value = buffer_append(var._value, text)
+        return next_ins
+    return run
+
+
+def move(prg_cntr: int, args: list, types: tuple):
+    """ MOVE <var> <symb> """
+    if types[1] is None:
+        return None
+    get_var = CoreData.var_getter(args[0])
+    get_op1 = CoreData.symbol_getter(args[1])
+    result_type = types[1]
+    next_ins = prg_cntr + 1
+
+    if result_type == 'string':
+        # string buffer of the source variable must not be shared
+        def run():
+            var: Variable = get_var()
+            var._value = str(get_op1()._value)
+            var._type = result_type
+            return next_ins
+        return run
+
+    def run():
+        var: Variable = get_var()
+        var._value = get_op1()._value
+        var._type = result_type
+        return next_ins
+    return run
+
+
+def _unary(operation, operand_type: str, result_type: str):
+    """Return builder of instruction <var> = operation(<symb>)"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] != operand_type:
+            return None
+        get_var = CoreData.var_getter(args[0])
+        get_op1 = CoreData.symbol_getter(args[1])
+        next_ins = prg_cntr + 1
+
+        def run():
+            var: Variable = get_var()
+            var._value = operation(get_op1()._value)
+            var._type = result_type
+            return next_ins
+        return run
+    return build
+
+
+def _string_index(operation, result_type: str):
+    """Return builder of GETCHAR/STRI2INT instruction"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if types[1] != 'string' or types[2] != 'int':
+            return None
+        get_var = CoreData.var_getter(args[0])
+        get_op1 = CoreData.symbol_getter(args[1])
+        get_op2 = CoreData.symbol_getter(args[2])
+        next_ins = prg_cntr + 1
+
+        def run():
+            var: Variable = get_var()
+            string = get_op1()._value
+            index = get_op2()._value
+
+            # index range check
+            if index < 0 or index >= len(string):
+                ErrorCode.exit_error(f"Wrong string handling while executing {prg_cntr+1}. command",
+                                     ErrorCode.RUNTIME_STRING_HANDLING)
+
+            var._value = operation(string[index])
+            var._type = result_type
+            return next_ins
+        return run
+    return build
+
+
+def _conditional_jump(jump_if_equal: bool):
+    """Return builder of JUMPIFEQ/JUMPIFNEQ instruction"""
+    def build(prg_cntr: int, args: list, types: tuple):
+        if not _comparable(types):
+            return None
+        target = CoreData.labels[args[0].value]
+        get_op1 = CoreData.symbol_getter(args[1])
+        next_ins = prg_cntr + 1
+
+        if args[2].type != 'var':
+            # constant operand is bound directly
+            value2 = args[2].value
+            def run():
+                if (get_op1()._value == value2) == jump_if_equal:
+                    return target
+                return next_ins
+            return run
+
+        get_op2 = CoreData.symbol_getter(args[2])
+        def run():
+            if (get_op1()._value == get_op2()._value) == jump_if_equal:
+                return target
+            return next_ins
+        return run
+    return build
+
+
+typed_instruct_set = {
+        'MOVE': move,
+        'ADD': _arithmetic(operator.add),
+        'SUB': _arithmetic(operator.sub),
+        'MUL': _arithmetic(operator.mul),
+        'DIV': _division(operator.truediv, 'float'),
+        'IDIV': _division(operator.floordiv),
+        'LT': _relation(operator.lt),
+        'GT': _relation(operator.gt),
+        'EQ': eq,
+        'AND': _logic(operator.and_),
+        'OR': _logic(operator.or_),
+        'NOT': _unary(operator.not_, 'bool', 'bool'),
+        'INT2FLOAT': _unary(float, 'int', 'float'),
+        'FLOAT2INT': _unary(int, 'float', 'int'),
+        'STRI2INT': _string_index(ord, 'int'),
+        'CONCAT': concat,
+        'STRLEN': _unary(len, 'string', 'int'),
+        'GETCHAR': _string_index(str, 'string'),
+        'JUMPIFEQ': _conditional_jump(True),
+        'JUMPIFNEQ': _conditional_jump(False),
+        }
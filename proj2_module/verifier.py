@@ -0,0 +1,117 @@
+"""Load-time check of instruction operands
+
+Every instruction is checked once against its signature before the program
+is built, so instruction handlers don't have to check number and kinds
+of their operands.
+
+Author: Hung Do
+File:   verifier.py
+Module: proj2_module
+"""
+from .error import ErrorCode
+from .statement import Statement
+
+# operand kinds and data types of arguments they accept
+OPERAND_KINDS = {
+        'var': ('var',),
+        'symb': ('var', 'int', 'bool', 'string', 'nil', 'float'),
+        'label': ('label',),
+        'type': ('type',),
+        }
+
+SIGNATURES = {
+        'MOVE': ('var', 'symb'),
+        'CREATEFRAME': (),
+        'PUSHFRAME': (),
+        'POPFRAME': (),
+        'DEFVAR': ('var',),
+        'CALL': ('label',),
+        'RETURN': (),
+        'PUSHS': ('symb',),
+        'CLEARS': (),
+        'POPS': ('var',),
+        'ADD': ('var', 'symb', 'symb'),
+        'SUB': ('var', 'symb', 'symb'),
+        'MUL': ('var', 'symb', 'symb'),
+        'DIV': ('var', 'symb', 'symb'),
+        'IDIV': ('var', 'symb', 'symb'),
+        'LT': ('var', 'symb', 'symb'),
+        'GT': ('var', 'symb', 'symb'),
+        'EQ': ('var', 'symb', 'symb'),
+        'AND': ('var', 'symb', 'symb'),
+        'OR': ('var', 'symb', 'symb'),
+        'NOT': ('var', 'symb'),
+        'INT2CHAR': ('var', 'symb'),
+        'STRI2INT': ('var', 'symb', 'symb'),
+        'INT2FLOAT': ('var', 'symb'),
+        'FLOAT2INT': ('var', 'symb'),
+        'READ': ('var', 'type'),
+        'WRITE': ('symb',),
+        'CONCAT': ('var', 'symb', 'symb'),
+        'STRLEN': ('var', 'symb'),
+        'GETCHAR': ('var', 'symb', 'symb'),
+        'SETCHAR': ('var', 'symb', 'symb'),
+        'TYPE': ('var', 'symb'),
+        'LABEL': ('label',),
+        'JUMP': ('label',),
+        'JUMPIFEQ': ('label', 'symb', 'symb'),
+        'JUMPIFNEQ': ('label', 'symb', 'symb'),
+        'EXIT': ('symb',),
+        'DPRINT': ('symb',),
+        'BREAK': (),
+
+        'ADDS': (),
+        'SUBS': (),
+        'MULS': (),
+        'DIVS': (),
+        'IDIVS': (),
+        'LTS': (),
+        'GTS': (),
+        'EQS': (),
+        'ANDS': (),
+        'ORS': (),
+        'NOTS': (),
+        'INT2CHARS': (),
+        'STRI2INTS': (),
+        'INT2FLOATS': (),
+        'FLOAT2INTS': (),
+        'JUMPIFEQS': ('label',),
+        'JUMPIFNEQS': ('label',),
+        }
+
+
+def verify_statement(stat: Statement) -> bool:
+    """Check number and kinds of instruction's operands
+
+    Parameters:
+    stat (Statement): Checked instruction
+
+    Returns:
+    bool: True if instruction doesn't match its signature otherwise False
+
+    """
+    signature = SIGNATURES[stat.ins]
+    if len(stat.args) != len(signature):
+        return True
+    for arg, kind in zip(stat.args, signature):
+        if arg.type not in OPERAND_KINDS[kind]:
+            return True
+    return False
+
+
+def verify_program(lof_ins: list):
+    """Check all instructions against their signatures
+
+    Terminate program with code ErrorCode.XML_STRUCTURE_ERROR
+    when error occure.
+
+    Parameters:
+    lof_ins (list): List of instructions (Statement) extracted from XML file
+
+    """
+    for stat in lof_ins:
+        if verify_statement(stat):
+            ErrorCode.exit_error(
+                    f"Error while checking instruction {stat.order}:"
+                    f"Wrong operands of {stat.ins} instruction",
+                    ErrorCode.XML_STRUCTURE_ERROR)
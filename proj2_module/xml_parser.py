@@ -8,15 +8,31 @@ import re
 import sys
 import xml.etree.ElementTree as ET
 
-from proj2_module.statement import Statement
+from proj2_module.statement import Statement, Argument
 from proj2_module.coredata import CoreData
-from proj2_module.error import ErrorCode
+from proj2_module.error import ErrorCode, ProgramExit
 from proj2_module.instruction_set import instruct_set
 
+ARG_TAG = re.compile('^arg[1-3]$')
+# compiled value formats of symbols
+FORMAT_PATTERNS = {
+    'var':      re.compile(f'^{CoreData.REG_TYPE["var"]}$'),
+    'string':   re.compile(f'^{CoreData.REG_TYPE["string"]}$'),
+    'type':     re.compile(f'^{CoreData.REG_TYPE["type"]}$'),
+    'label':    re.compile(f'^{CoreData.REG_TYPE["label"]}$'),
+    'float':    re.compile(f'^({CoreData.REG_TYPE["float_hex"]}|{CoreData.REG_TYPE["float"]})$'),
+    'int':      re.compile(f'^{CoreData.REG_TYPE["int"]}$'),
+}
+# arguments used when the program is loaded (frame slots and jump
+# destinations), their format is checked even in lazy mode
+LOAD_TIME_TYPES = ('var', 'label')
+
+
 def format_validation(dtype: str, value):
     """XML data type value format validation
 
-    Validation is done with regular expression stored in CoreData.REG_TYPE.
+    Validation is done with regular expressions from CoreData.REG_TYPE
+    compiled in FORMAT_PATTERNS.
 
     Parameters:
     dtype (str): Symbol's data type 
@@ -26,27 +42,14 @@ def format_validation(dtype: str, value):
     bool: True if value format is invalid otherwise False.
 
     """
-    if dtype == 'var':
-        if not re.match(f'^{CoreData.REG_TYPE["var"]}$', value):
-            return True
-    elif dtype == 'string':
-        if value is None:
-            value = ''
-        if not re.match(f'^{CoreData.REG_TYPE["string"]}$', value):
-            return True
-    elif dtype == 'type':
-        if not re.match(f'^{CoreData.REG_TYPE["type"]}$', value):
-            return True
-    elif dtype == 'label':
-        if not re.match(f'^{CoreData.REG_TYPE["label"]}$', value):
-            return True
-    elif dtype == 'float':
-        if not re.match(f'^({CoreData.REG_TYPE["float_hex"]}|{CoreData.REG_TYPE["float"]})$', value):
-            return True
-    elif dtype == 'int':
-        if not re.match(f'^{CoreData.REG_TYPE["int"]}$', value):
+    pattern = FORMAT_PATTERNS.get(dtype)
+    if pattern is None:
+        return False
+    if value is None:
+        if dtype != 'string':
             return True
-    return False
+        value = ''
+    return pattern.match(value) is None
 
 
 def root_element_validation(root: ET.Element) -> bool:
@@ -125,82 +128,174 @@ def inst_element_validation(inst: ET.Element, order_used: list):
     return opcode, order
 
 
-def argument_attr_check(table_args: dict) -> list:
+def argument_attr_check(args_vals: list) -> list:
     """Check 'args' elemet strucure
 
-    After checking the validity of the table function sorts arguments from
-    arg1 to arg3 depending on the size of the table.
+    Arguments are stored in slots indexed by their tag number (arg1 to arg3),
+    function checks that filled slots form sequence starting from arg1.
 
     Terminate program with code ErrorCode.XML_STRUCTURE_ERROR
     when error occure.
 
     Parameters:
-    table_args (dict):  List of arguments of the instruction
+    args_vals (list):   Arguments of the instruction in slots arg1-arg3
+
+    Returns:
+    list: Arguments sorted from arg1 to arg3
     """
-    args_vals = []
-    # validate args tags
-    keys = table_args.keys()
-    if ((len(keys) > 0 and 'arg1' not in keys) or
-        (len(keys) > 1 and 'arg2' not in keys) or
-        (len(keys) > 2 and 'arg3' not in keys)):
+    count = 3
+    while count > 0 and args_vals[count - 1] is None:
+        count -= 1
+    if None in args_vals[:count]:
         ErrorCode.exit_error(
                 "Error while loading argument elements:"
                 "Argument sequence is invalid",
                 ErrorCode.XML_STRUCTURE_ERROR)
+    return args_vals[:count]
+
+
+def load_instruction(inst: ET.Element, order_used: list, lazy: bool=False) -> Statement:
+    """Validate and convert finished 'instruction' element
+
+    Parameters:
+    inst (ET.Element):  Instruction element with its arguments
+    order_used (list):  List of order values that have been already used
+    lazy (bool):        Leave format check and decoding of arguments
+                        to decode_statement
+
+    Returns:
+    Statement: Loaded instruction
+    """
+    opcode, order = inst_element_validation(inst, order_used)
+    args_vals = [None, None, None]
+
+    # arguments check
+    for args_element in inst:
+        if not ARG_TAG.match(args_element.tag):
+            ErrorCode.exit_error(
+                    "Error while loading argument elements:"
+                    "Invalid tag name, arg1/arg2/arg3 expected",
+                    ErrorCode.XML_STRUCTURE_ERROR)
+
+        arg_type = args_element.get('type')
+        if ((not lazy or arg_type in LOAD_TIME_TYPES)
+                and format_validation(arg_type, args_element.text)):
+            ErrorCode.exit_error(
+                    "Argument format error.",
+                    ErrorCode.XML_STRUCTURE_ERROR)
+        args_vals[int(args_element.tag[3]) - 1] = (arg_type, args_element.text)
+
+    stat = Statement(opcode, order, argument_attr_check(args_vals), not lazy)
+    CoreData.update_label_data(stat)
+    return stat
+
+
+def decode_statement(stat: Statement):
+    """Check format of arguments and decode their values
+
+    Used for instructions loaded in lazy mode, already decoded
+    instructions are left unchanged.
+
+    Terminate program with code ErrorCode.XML_STRUCTURE_ERROR
+    when error occure.
+
+    Parameters:
+    stat (Statement): Loaded instruction
 
-    for key in sorted(table_args.keys()):
-        args_vals.append(table_args[key])
-    return args_vals
+    """
+    if stat.decoded:
+        return
+    for index, arg in enumerate(stat.args):
+        if format_validation(arg.type, arg.value):
+            ErrorCode.exit_error(
+                    f"Argument format error in instruction {stat.order}.",
+                    ErrorCode.XML_STRUCTURE_ERROR)
+        stat.args[index] = Argument((arg.type, arg.value))
+    stat.decoded = True
 
 
-def xml_parser() -> list:
+def stream_instructions(events, order_used: list, lazy: bool=False):
+    """Stream instructions from XML source file
+
+    Document is read incrementally, each instruction is converted as soon
+    as its element is closed and then dropped from the tree, so memory usage
+    does not depend on the size of the document.
+
+    Parameters:
+    events (iterator):  Iterator over ('start', 'end') parser events
+    order_used (list):  List of order values that have been already used
+    lazy (bool):        Don't decode arguments of instructions
+
+    Returns:
+    generator: Loaded statements in document order
+    """
+    depth = 0
+    program = None
+    for event, elem in events:
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                program = elem
+                # check root attributes
+                if root_element_validation(program):
+                    ErrorCode.exit_error(
+                            "Error while loading root element",
+                            ErrorCode.XML_STRUCTURE_ERROR)
+            continue
+
+        depth -= 1
+        if depth == 1:
+            yield load_instruction(elem, order_used, lazy)
+            # finished instruction is not needed anymore
+            program.clear()
+
+
+def xml_parser(lazy: bool=False) -> list:
     """Full XML source file check
 
+    In lazy mode only structure of the document, operation codes, order
+    values, labels and variables are checked. Other arguments are checked
+    and decoded by decode_statement before the instruction is executed.
+
+    Parameters:
+    lazy (bool): Don't check format of arguments and don't decode them
+
     Returns:
     list: List of (unsorted) loaded operations
     """
 
     lof_ins = []
-    # TODO: check if file exists
-    xml_path = sys.stdin if CoreData.source_file is None else CoreData.source_file
+    if CoreData.source_file is not None:
+        xml_path = CoreData.source_file
+    elif CoreData.source_stream is not None:
+        xml_path = CoreData.source_stream
+    else:
+        xml_path = sys.stdin.buffer
+    order_numbers = []
 
+    # loading operations
     try:
-        tree = ET.parse(xml_path)
-    except:
+        events = ET.iterparse(xml_path, events=('start', 'end'))
+    except OSError:
+        # unreadable source (e.g. directory) is reported as malformed XML
         ErrorCode.exit_error("Input XML file is not well-formed!",
                              ErrorCode.XML_FORMAT_ERROR)
-    program = tree.getroot()
-    # check root attributes
-    if root_element_validation(program):
-        ErrorCode.exit_error(
-                "Error while loading root element",
-                ErrorCode.XML_STRUCTURE_ERROR)
-
-    order_numbers = []
-
-    # loading operations
-    for inst in program:
-        opcode, order = inst_element_validation(inst, order_numbers)
-        table_args   = {}
-
-        # arguments check
-        for args_element in inst:
-            if not re.match("^arg[1-3]$", args_element.tag):
-                ErrorCode.exit_error(
-                        "Error while loading argument elements:"
-                        "Invalid tag name, arg1/arg2/arg3 expected",
-                        ErrorCode.XML_STRUCTURE_ERROR)
-
-            if format_validation(args_element.get('type'), args_element.text):
-                ErrorCode.exit_error(
-                        "Argument format error.",
-                        ErrorCode.XML_STRUCTURE_ERROR)
-            table_args[args_element.tag] = (args_element.get('type'), args_element.text)
-
-        args = argument_attr_check(table_args)
-        stat = Statement(opcode, order, args)
-        CoreData.update_label_data(stat)
-        lof_ins.append(stat)
+    try:
+        for stat in stream_instructions(events, order_numbers, lazy):
+            lof_ins.append(stat)
+    except ET.ParseError:
+        ErrorCode.exit_error("Input XML file is not well-formed!",
+                             ErrorCode.XML_FORMAT_ERROR)
+    except ProgramExit as structure_error:
+        # document has to be well-formed first, same as when it is parsed
+        # as a whole before its structure is checked
+        try:
+            for _, elem in events:
+                elem.clear()
+        except ET.ParseError:
+            ErrorCode.exit_error("Input XML file is not well-formed!",
+                                 ErrorCode.XML_FORMAT_ERROR)
+        raise structure_error
 
     # check for jumps to undefined labels and duplicates
     if len(CoreData.undef_labels) > 0:
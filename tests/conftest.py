@@ -0,0 +1,36 @@
+"""Shared helpers of interpreter tests
+
+Author: Hung Do
+File:   conftest.py
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PROGRAM_DIR = os.path.join(TEST_DIR, 'programs')
+REPO_DIR = os.path.dirname(TEST_DIR)
+INTERPRETER = os.path.join(REPO_DIR, 'interpret.py')
+
+# proj2_module is importable by tests
+sys.path.insert(0, REPO_DIR)
+
+
+def run_interpreter(args: list, stdin: bytes=b'') -> subprocess.CompletedProcess:
+    """Run interpreter process with the arguments"""
+    return subprocess.run([sys.executable, INTERPRETER] + args, input=stdin,
+                          capture_output=True, timeout=60)
+
+
+@pytest.fixture
+def interpret():
+    """Function running interpreter process (see run_interpreter)"""
+    return run_interpreter
+
+
+@pytest.fixture
+def program():
+    """Function returning path to the test program"""
+    return lambda name: os.path.join(PROGRAM_DIR, name)
@@ -0,0 +1,40 @@
+"""Tests of equivalence of execution engines
+
+Every program is run as a separate interpreter process, the same way
+as the interpreter is used.
+
+Usage: python3 -m pytest tests
+
+Author: Hung Do
+File:   test_engines.py
+"""
+import pytest
+
+ENGINES = {
+        'threaded': ['--engine', 'threaded'],
+        'codegen':  ['--engine', 'codegen'],
+        }
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_break_counts_executed_instructions(interpret, program, engine):
+    result = interpret(['--source', program('break_loop.xml')] + ENGINES[engine])
+
+    assert result.returncode == 0
+    assert result.stdout == b'2'
+    assert b'Pocet vykonanych instrukci: 15\n' in result.stderr
+
+
+def test_break_output_same_for_engines(interpret, program):
+    results = [interpret(['--source', program('break_loop.xml')] + args)
+               for args in ENGINES.values()]
+
+    assert len({result.stderr for result in results}) == 1
+
+
+@pytest.mark.parametrize('mode', [[], ['--lazy']])
+def test_empty_var_operand_is_format_error(interpret, program, mode):
+    result = interpret(['--source', program('empty_var.xml')] + mode)
+
+    assert result.returncode == 32
+    assert b'Traceback' not in result.stderr
@@ -0,0 +1,67 @@
+"""Tests of program images and loading of sources
+
+Author: Hung Do
+File:   test_images.py
+"""
+import marshal
+
+import pytest
+
+from proj2_module.program_image import IMAGE_HEADER
+
+MODES = {
+        'xml':          [],
+        'lazy':         ['--lazy'],
+        'codegen':      ['--engine', 'codegen'],
+        }
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_directory_source_is_malformed_xml(interpret, tmp_path, mode):
+    result = interpret(['--source', str(tmp_path)] + MODES[mode])
+
+    assert result.returncode == 31
+    assert b'Traceback' not in result.stderr
+
+
+def test_directory_source_with_image_cache(interpret, tmp_path):
+    result = interpret(['--source', str(tmp_path),
+                        '--image-cache', str(tmp_path / 'cache')])
+
+    assert result.returncode == 31
+    assert b'Traceback' not in result.stderr
+
+
+def test_image_runs_as_source(interpret, program, tmp_path):
+    image = str(tmp_path / 'program.ippc')
+    compiled = interpret(['--source', program('break_loop.xml'), '--compile-only', image])
+    from_xml = interpret(['--source', program('break_loop.xml')])
+    from_image = interpret(['--source', image])
+
+    assert compiled.returncode == 0
+    assert (from_image.returncode, from_image.stdout, from_image.stderr) == \
+           (from_xml.returncode, from_xml.stdout, from_xml.stderr)
+
+
+DAMAGED_IMAGES = {
+        'shape':        ({}, ((1, 2),)),
+        'not_tuple':    7,
+        'labels':       ([1], ()),
+        'opcode':       ({}, (('FOO', 1, (), None),)),
+        'arity':        ({}, (('WRITE', 1, (), None),)),
+        'operand_kind': ({}, (('WRITE', 1, (('label', 'x'),), None),)),
+        'label':        ({}, (('JUMP', 1, (('label', 'x'),), None),)),
+        'destination':  ({'x': 7}, (('LABEL', 1, (('label', 'x'),), None),)),
+        'var':          ({}, (('DEFVAR', 1, (('var', None),), None),)),
+        'types':        ({}, (('WRITE', 1, (('int', 1),), ('int', 'int')),)),
+        }
+
+
+@pytest.mark.parametrize('content', DAMAGED_IMAGES)
+def test_damaged_image(interpret, tmp_path, content):
+    image = tmp_path / 'program.ippc'
+    image.write_bytes(IMAGE_HEADER + marshal.dumps(DAMAGED_IMAGES[content]))
+    result = interpret(['--source', str(image)])
+
+    assert result.returncode == 31
+    assert b'damaged' in result.stderr
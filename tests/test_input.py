@@ -0,0 +1,67 @@
+"""Tests of input of READ instruction
+
+Expected outputs are outputs of the original interpreter, it reads stdin
+by input() and input file in text mode.
+
+Author: Hung Do
+File:   test_input.py
+"""
+import asyncio
+import io
+
+import pytest
+
+from proj2_module import Interpreter, AsyncInterpreter
+
+# input, output with stdin, output with input file
+LINE_ENDINGS = {
+        'cr':   (b'a\rb\r\n',
+                 b'nilnilnilnil',
+                 b'nilbfalsenilnilnil'),
+        'crlf': (b'1\r\nx\r\ntrue\r\n0x1p+1\r\n',
+                 b'1intx\rfalse0x1.0000000000000p+1nilnilnil',
+                 b'1intxtrue0x1.0000000000000p+1nilnilnil'),
+        }
+
+
+@pytest.mark.parametrize('case', LINE_ENDINGS)
+def test_stdin_keeps_carriage_return(interpret, program, case):
+    data, expected, _ = LINE_ENDINGS[case]
+    result = interpret(['--source', program('read_types.xml')], stdin=data)
+
+    assert result.stdout == expected
+
+
+@pytest.mark.parametrize('case', LINE_ENDINGS)
+def test_input_file_has_universal_newlines(interpret, program, tmp_path, case):
+    data, _, expected = LINE_ENDINGS[case]
+    input_file = tmp_path / 'input.txt'
+    input_file.write_bytes(data)
+    result = interpret(['--source', program('read_types.xml'),
+                        '--input', str(input_file)])
+
+    assert result.stdout == expected
+
+
+@pytest.mark.parametrize('case', LINE_ENDINGS)
+def test_stream_object_keeps_carriage_return(program, case):
+    data, expected, _ = LINE_ENDINGS[case]
+    stdout = io.BytesIO()
+    Interpreter().run(program('read_types.xml'), io.BytesIO(data), stdout)
+
+    assert stdout.getvalue() == expected
+
+
+@pytest.mark.parametrize('case', LINE_ENDINGS)
+def test_async_reader_keeps_carriage_return(program, case):
+    data, expected, _ = LINE_ENDINGS[case]
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        stdout = io.BytesIO()
+        await AsyncInterpreter().run_async(program('read_types.xml'), reader, stdout)
+        return stdout.getvalue()
+
+    assert asyncio.run(run()) == expected
@@ -0,0 +1,53 @@
+"""Tests of one program executed with many inputs (--inputs)
+
+Author: Hung Do
+File:   test_inputs.py
+"""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    """Directory with inputs; two.rc is an input, not a result"""
+    for name, data in (('one.txt', '1\n'), ('two.rc', '2\n'), ('three', '3\n')):
+        (tmp_path / name).write_text(data)
+    return tmp_path
+
+
+def run_inputs(interpret, program, inputs: str, *args):
+    """Run --inputs and return exit code and parsed results"""
+    result = interpret(['--source', program('read_types.xml'), '--inputs', inputs,
+                        '-j', '2'] + list(args))
+    lines = result.stdout.decode().splitlines()
+    return result.returncode, [json.loads(line) for line in lines]
+
+
+def test_single_file_is_one_input(interpret, program, input_dir):
+    exit_code, results = run_inputs(interpret, program, str(input_dir / 'one.txt'))
+
+    assert exit_code == 0
+    assert [result['input'] for result in results] == [str(input_dir / 'one.txt')]
+    assert results[0]['stdout'].startswith('1int')
+
+
+@pytest.mark.parametrize('pattern', ['', '*'])
+def test_results_are_not_inputs(interpret, program, input_dir, pattern):
+    inputs = str(input_dir / pattern)
+    for _ in range(2):
+        exit_code, _ = run_inputs(interpret, program, inputs, '--outputs=files')
+        assert exit_code == 0
+
+    names = {path.name for path in input_dir.iterdir()}
+    assert names == {name + suffix for name in ('one.txt', 'two.rc', 'three')
+                     for suffix in ('', '.stdout', '.stderr', '.rc')}
+    assert (input_dir / 'two.rc.stdout').read_text().startswith('2int')
+
+
+def test_manifest_with_missing_input(interpret, program, input_dir):
+    (input_dir / 'list').write_text('one.txt\nmissing.txt\n')
+    exit_code, results = run_inputs(interpret, program, '@' + str(input_dir / 'list'))
+
+    assert exit_code == 99
+    assert [result['exit_code'] for result in results] == [0, 99]
@@ -0,0 +1,53 @@
+"""Tests of the embeddable interpreter
+
+Author: Hung Do
+File:   test_interpreter.py
+"""
+import asyncio
+import io
+import sys
+
+import pytest
+
+from proj2_module import Interpreter, AsyncInterpreter
+
+# output of read_types.xml with empty input
+EMPTY_INPUT_OUTPUT = 'nilnilnilnil'
+
+
+@pytest.mark.parametrize('stdout', [io.BytesIO, io.StringIO])
+def test_run_writes_to_stream(program, stdout):
+    stream = stdout()
+    exit_code = Interpreter().run(program('read_types.xml'), io.BytesIO(), stream)
+
+    assert exit_code == 0
+    output = stream.getvalue()
+    assert (output if isinstance(output, str) else output.decode()) == EMPTY_INPUT_OUTPUT
+
+
+def test_run_writes_to_text_wrapper(program):
+    raw = io.BytesIO()
+    stream = io.TextIOWrapper(raw, encoding='utf-8')
+    stream.write('before:')
+    Interpreter().run(program('read_types.xml'), io.BytesIO(), stream)
+
+    assert raw.getvalue().decode() == 'before:' + EMPTY_INPUT_OUTPUT
+
+
+@pytest.mark.parametrize('stdout', [io.BytesIO, io.StringIO])
+def test_run_async_writes_to_stream(program, stdout):
+    stream = stdout()
+    exit_code = asyncio.run(AsyncInterpreter().run_async(
+            program('read_types.xml'), io.BytesIO(), stream))
+
+    assert exit_code == 0
+    output = stream.getvalue()
+    assert (output if isinstance(output, str) else output.decode()) == EMPTY_INPUT_OUTPUT
+
+
+def test_errors_are_returned(program, tmp_path):
+    stderr = io.StringIO()
+    exit_code = Interpreter().run(str(tmp_path), io.BytesIO(), io.BytesIO(), stderr)
+
+    assert exit_code == 31
+    assert sys.stderr is not stderr
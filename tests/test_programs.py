@@ -0,0 +1,67 @@
+"""Tests of test programs in every execution mode
+
+Every program in tests/programs is run with each engine, lazy loading and
+from its compiled image. Output and exit code have to be the same as
+the expected ones (NAME.out, NAME.rc) and debug output as NAME.err when
+it exists. Input of the program is NAME.in (--input) or NAME.stdin.
+
+Expected outputs are outputs of the original interpreter, except for
+programs the original interpreter didn't check when they were loaded:
+x_arity (executed until the wrong instruction), x_kind, x_labelnoarg
+and empty_var (Python exceptions). They exit with 32 without output.
+
+Author: Hung Do
+File:   test_programs.py
+"""
+import os
+
+import pytest
+
+PROGRAM_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'programs')
+
+MODES = {
+        'threaded': ['--engine', 'threaded'],
+        'codegen':  ['--engine', 'codegen'],
+        'lazy':     ['--lazy'],
+        'image':    [],
+        }
+
+PROGRAMS = sorted(name[:-len('.rc')] for name in os.listdir(PROGRAM_DIR)
+                  if name.endswith('.rc'))
+
+
+def read_expected(name: str, suffix: str) -> bytes:
+    """Return content of the expected file; None if it doesn't exist"""
+    path = os.path.join(PROGRAM_DIR, name + suffix)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as _f:
+        return _f.read()
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('name', PROGRAMS)
+def test_program(interpret, tmp_path, name, mode):
+    source = os.path.join(PROGRAM_DIR, name + '.xml')
+    expected_rc = int(read_expected(name, '.rc'))
+    expected_out = read_expected(name, '.out')
+
+    if mode == 'image':
+        image = str(tmp_path / (name + '.ippc'))
+        compiled = interpret(['--source', source, '--compile-only', image])
+        if compiled.returncode != 0:
+            # error found when the program is loaded
+            assert (compiled.returncode, b'') == (expected_rc, expected_out)
+            return
+        source = image
+
+    args = ['--source', source] + MODES[mode]
+    stdin = read_expected(name, '.stdin') or b''
+    if read_expected(name, '.in') is not None:
+        args += ['--input', os.path.join(PROGRAM_DIR, name + '.in')]
+    result = interpret(args, stdin=stdin)
+
+    assert (result.returncode, result.stdout) == (expected_rc, expected_out)
+    expected_err = read_expected(name, '.err')
+    if expected_err is not None:
+        assert result.stderr == expected_err